@@ -1,10 +1,15 @@
 # backend/app/main.py
 
+import time
+STARTED = time.perf_counter()
+
 import uvicorn
 import os
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from backend.app.routers import (
@@ -12,13 +17,23 @@ from backend.app.routers import (
     book_details,
     chatbot,
     dashboard,
-    cover_analysis
+    cover_analysis,
+    health
 )
+from backend.app.utils.models import preload_models, record_startup
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    preload_models() # PLEIADE_PRELOAD_MODELS, in the background
+    record_startup(time.perf_counter() - STARTED)
+    yield
 
 app = FastAPI(
     title="My Book Analyzer",
     description="A simple API to analyze manuscripts (upload, chapter split, stats, etc.)",
-    debug=True
+    debug=True,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 covers_path = os.path.join("backend", "app", "storage", "covers")
@@ -43,6 +58,7 @@ app.include_router(book_details.router)
 app.include_router(chatbot.router)
 app.include_router(dashboard.router)
 app.include_router(cover_analysis.router)
+app.include_router(health.router)
 
 if __name__ == "__main__":
     uvicorn.run("backend.app.main:app", host="0.0.0.0", port=8000, reload=True)
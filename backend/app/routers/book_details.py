@@ -3,35 +3,22 @@
 import time
 
 from fastapi import APIRouter, HTTPException
-from backend.app.storage.storage import load_book_details, save_book_details
-from backend.app.utils.details.details import (
-    generate_overview_components,
-    generate_analysis_components,
-    generate_marketing_components
-)
+from backend.app.storage.storage import book_details_session, DETAILS_SECTIONS
+from backend.app.utils.details.details import generate_details
 
 router = APIRouter()
 
+# Plain def: the generation (minutes of blocking LLM calls) runs in FastAPI's thread pool, not on the event loop
 @router.get("/books/{book_id}/details")
-async def get_book_details(book_id: str):
+def get_book_details(book_id: str):
     start = time.time()
     try: 
-        book_data = load_book_details(book_id)
-
-        if "analysis" not in book_data:
-            print(f"[GET_BOOK_DETAILS] Generating analysis for book {book_id}...")
-            book_data["analysis"] = generate_analysis_components(book_id)
-            save_book_details(book_id, book_data)
-
-        if "overview" not in book_data:
-            print(f"[GET_BOOK_DETAILS] Generating overview for book {book_id}...")
-            book_data["overview"] = generate_overview_components(book_id)
-            save_book_details(book_id, book_data)
-
-        if "marketing" not in book_data:
-            print(f"[GET_BOOK_DETAILS] Generating marketing for book {book_id}...")
-            book_data["marketing"] = generate_marketing_components(book_id)
-            save_book_details(book_id, book_data)
+        # sections generated below are flushed together in one atomic write when the block exits
+        with book_details_session(book_id) as book_data:
+            missing = [section for section in DETAILS_SECTIONS if section not in book_data]
+            if missing:
+                # independent stages of the three sections run concurrently, each section is kept as soon as it is complete
+                generate_details(book_id, missing, dict(book_data), on_section=book_data.__setitem__)
 
         print(f"[GET_BOOK_DETAILS ROOTER] Finished in {time.time() - start:.2f} seconds")
         return book_data
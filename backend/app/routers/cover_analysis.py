@@ -1,11 +1,11 @@
 # backend/app/routers/cover_analysis.py
 
 import base64
-import json
 from fastapi import APIRouter, HTTPException
 from pathlib import Path
 from typing import List
 
+from backend.app.storage import serialization
 from backend.app.utils.cover_analysis.cover_analysis import analyze_cover
 
 router = APIRouter()
@@ -17,8 +17,7 @@ def cover_analysis_tab_bookid(book_id: str):
 
     if analysis_path.exists():
         try:
-            with open(analysis_path, "r") as f:
-                return json.load(f)
+            return serialization.load_file(analysis_path)
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to read cached analysis: {str(e)}")
 
@@ -34,9 +33,7 @@ def cover_analysis_tab_bookid(book_id: str):
     analysis = analyze_cover(base64_image)
 
     try:
-        analysis_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(analysis_path, "w") as f:
-            json.dump(analysis, f, indent=2)
+        serialization.dump_file(analysis_path, analysis)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to save analysis: {str(e)}")
 
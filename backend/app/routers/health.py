@@ -0,0 +1,22 @@
+# backend/app/routers/health.py
+
+from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
+
+from backend.app.utils.models import model_report
+from backend.app.storage.llm_cache import cache_stats
+
+router = APIRouter()
+
+@router.get("/health")
+def health():
+    """Liveness: the process answers."""
+    return {"status": "ok"}
+
+@router.get("/health/ready")
+def readiness():
+    """Readiness: local nltk data present and preloaded models loaded (503 otherwise), with load times and memory,
+    and the LLM response cache counters."""
+    report = model_report()
+    report["llm_cache"] = cache_stats()
+    return ORJSONResponse(content=report, status_code=200 if report["ready"] else 503)
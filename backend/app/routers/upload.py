@@ -1,41 +1,36 @@
 # backend/app/routers/upload.py
 
-import datetime
 import secrets
-import tiktoken
-import pdfplumber
-import nltk
-nltk.download("punkt_tab")
 
 from fastapi import APIRouter, UploadFile, HTTPException
-from fastapi import File, Form
+from fastapi import File, Form, Query
+from fastapi.concurrency import run_in_threadpool
 from typing import Optional
 
 from backend.app.storage.storage import (
-    save_book, load_books, save_book_details,
-    save_cover_image, load_book_details
+    load_catalog_page, load_book_meta, save_cover_image, save_upload, load_job,
+    CATALOG_PAGE_SIZE, CATALOG_MAX_PAGE_SIZE
 )
-from backend.app.utils.preprocessing.preprocessing import preprocessing_pipeline
-
-enc = tiktoken.get_encoding("cl100k_base")
+from backend.app.utils.preprocessing.ingestion import create_ingestion_job, submit_ingestion_job
 
 router = APIRouter()
 
 @router.get("/books")
-def get_books():
-    print("[get_books] Fetching all books.")
-    books = load_books()
-
-    for book in books:
-        details = load_book_details(book["id"])
-        book["hasDetails"] = bool(
-            details
-            and "analysis" in details
-            and "overview" in details
-            and "marketing" in details
+def get_books(
+    cursor: Optional[str] = None,
+    limit: int = Query(CATALOG_PAGE_SIZE, ge=1, le=CATALOG_MAX_PAGE_SIZE),
+    fields: Optional[str] = None
+):
+    """Catalog page: {"items": [...], "next_cursor": ...}. fields is a comma separated subset of the catalog fields."""
+    print(f"[get_books] Fetching books after {cursor or 'start'} (limit {limit}).")
+    try:
+        return load_catalog_page(
+            cursor=cursor,
+            limit=limit,
+            fields=[f.strip() for f in fields.split(",") if f.strip()] if fields else None
         )
-
-    return books
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.post("/upload")
@@ -43,59 +38,56 @@ async def upload_file(
     file: UploadFile = File(...),
     title: Optional[str] = Form(None),
     author: Optional[str] = Form(None),
-    cover: Optional[UploadFile] = File(None)
+    cover: Optional[UploadFile] = File(None),
+    revision_of: Optional[str] = Form(None)
 ):
+    """
+    Store the manuscript and queue its ingestion. Progress is reported by GET /upload/jobs/{job_id}.
+    With revision_of, the upload is a new draft of that book: it keeps its id, and its title, author
+    and cover unless new ones are given.
+    """
     print(f"[upload_file] Received file upload: {file.filename}")
 
+    previous = {}
+    if revision_of:
+        try:
+            previous = load_book_meta(revision_of)
+        except ValueError:
+            raise HTTPException(status_code=404, detail=f"Book '{revision_of}' not found.")
+        book_id = revision_of
+    else:
+        book_id = secrets.token_hex(4)
+    # book_id = "demo" # For demo purposes, using a fixed ID
     try:
-        pages = 0
-
-        if file.filename.endswith(".pdf"):
-            print("[upload_file] Detected PDF file. Extracting text...")
-            with pdfplumber.open(file.file) as pdf:
-                text = "\n".join([page.extract_text() or "" for page in pdf.pages])
-                pages = len(pdf.pages)
-        else:
-            content = await file.read()
-            text = content.decode("utf-8", errors="replace")
-            pages = text.count("\n") // 30  # rough estimate for .txt
-
-        chunks = preprocessing_pipeline(text)
-        print(f"[upload_file] File '{file.filename}' processed successfully.")
-
+        content = await file.read()
+        upload_path = await run_in_threadpool(save_upload, book_id, file.filename, content)
     except Exception as e:
         print(f"[upload_file] Unexpected error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-    book_id = secrets.token_hex(4)
-    # book_id = "demo" # For demo purposes, using a fixed ID
     cover_url = ""
     if cover:
         cover_bytes = await cover.read()
         cover_url = save_cover_image(book_id, cover_bytes)
 
-    book_data = {
-        "id": book_id,
-        "title": title or file.filename.replace(".txt", "").replace(".pdf", ""),
-        "cover": cover_url or "/covers/no_cover.png",
-        "author": author or "Author Unknown",
-        "uploadDate": datetime.datetime.now().isoformat(),
-        "pages": pages,
-        "chunks": [
-            {
-                "chunk_id": i,
-                "chunk_text": chunks[i]
-            }
-            for i in range(len(chunks))
-        ],
-        "text": text
-    }
-
-    save_book(book_data)
-    print(f"[upload_file] Book data saved with ID: {book_id}")
-
-    default_details = {}
-    save_book_details(book_id, default_details)
-    print(f"[upload_file] Initiated detail instance with: {book_id}")
-
-    return {"id": book_id}
+    job = create_ingestion_job(
+        book_id,
+        upload_path,
+        file.filename,
+        title=title or previous.get("title") or file.filename.replace(".txt", "").replace(".pdf", ""),
+        author=author or previous.get("author") or "Author Unknown",
+        cover=cover_url or previous.get("cover") or "/covers/no_cover.png",
+        revision_of=revision_of
+    )
+    submit_ingestion_job(job)
+    print(f"[upload_file] Queued ingestion job {job['id']} for book {book_id}")
+
+    return {"id": book_id, "job_id": job["id"]}
+
+
+@router.get("/upload/jobs/{job_id}")
+def get_upload_job(job_id: str):
+    job = load_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found.")
+    return job
@@ -0,0 +1,128 @@
+# backend/app/storage/compression.py
+
+import bisect
+import os
+import threading
+import zstandard as zstd
+
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional
+
+from backend.app.storage import serialization
+
+# "none" (default) or "zstd". Only affects new writes, both formats are always readable.
+STORAGE_COMPRESSION = os.getenv("PLEIADE_STORAGE_COMPRESSION", "none").lower()
+COMPRESSION_LEVEL = int(os.getenv("PLEIADE_STORAGE_COMPRESSION_LEVEL", "10"))
+
+DICTS_PATH = Path("backend/app/storage/zstd_dicts")
+DICT_SIZE = 112_640 # zstd's default dictionary size
+DICT_RECORD_LIMIT = 64 * 1024 # records above this size compress well on their own
+FRAME_SIZE = 1 << 20 # the manuscript text is cut in 1 MiB frames so a prefix read stays cheap
+
+_dictionary_lock = threading.Lock()
+_current_dictionary = None # (dict_id, ZstdCompressionDict) or False when no dictionary was trained
+
+def enabled() -> bool:
+    return STORAGE_COMPRESSION == "zstd"
+
+# DICTIONARIES
+# Each trained dictionary is kept under its dict id: frames record the id of the dictionary they
+# were compressed with, so retraining never breaks older records.
+
+@lru_cache(maxsize=8)
+def _load_dictionary(dict_id: int) -> zstd.ZstdCompressionDict:
+    with open(DICTS_PATH / f"{dict_id}.dict", "rb") as f:
+        return zstd.ZstdCompressionDict(f.read())
+
+def _get_current_dictionary():
+    global _current_dictionary
+    if _current_dictionary is None:
+        with _dictionary_lock:
+            if _current_dictionary is None:
+                paths = sorted(DICTS_PATH.glob("*.dict"), key=lambda p: p.stat().st_mtime)
+                if paths:
+                    dict_id = int(paths[-1].stem)
+                    _current_dictionary = (dict_id, _load_dictionary(dict_id))
+                else:
+                    _current_dictionary = False
+    return _current_dictionary or None
+
+def train_dictionary(samples: List[bytes], dict_size: int = DICT_SIZE) -> Optional[int]:
+    """Train a dictionary on small records and make it the one used for new writes."""
+    global _current_dictionary
+    samples = [s for s in samples if 0 < len(s) <= DICT_RECORD_LIMIT]
+    try:
+        dictionary = zstd.train_dictionary(dict_size, samples, level=COMPRESSION_LEVEL)
+    except zstd.ZstdError as e:
+        print(f"[COMPRESSION] Could not train dictionary on {len(samples)} samples: {e}")
+        return None
+
+    DICTS_PATH.mkdir(parents=True, exist_ok=True)
+    with open(DICTS_PATH / f"{dictionary.dict_id()}.dict", "wb") as f:
+        f.write(dictionary.as_bytes())
+    with _dictionary_lock:
+        _current_dictionary = (dictionary.dict_id(), dictionary)
+    print(f"[COMPRESSION] Trained dictionary {dictionary.dict_id()} on {len(samples)} samples.")
+    return dictionary.dict_id()
+
+# FRAMES
+
+def compress(data: bytes) -> bytes:
+    dictionary = _get_current_dictionary() if len(data) <= DICT_RECORD_LIMIT else None
+    if dictionary:
+        return zstd.ZstdCompressor(level=COMPRESSION_LEVEL, dict_data=dictionary[1]).compress(data)
+    return zstd.ZstdCompressor(level=COMPRESSION_LEVEL).compress(data)
+
+def _decompressor(header: bytes) -> zstd.ZstdDecompressor:
+    dict_id = zstd.get_frame_parameters(header).dict_id
+    if dict_id:
+        return zstd.ZstdDecompressor(dict_data=_load_dictionary(dict_id))
+    return zstd.ZstdDecompressor()
+
+def decompress(frame: bytes) -> bytes:
+    return _decompressor(frame).decompress(frame)
+
+def compress_parts(parts: List[bytes]):
+    """
+    Compress consecutive byte parts as independent frames.
+    Returns (data, frames) where each frame is [uncompressed start, uncompressed end, compressed start, compressed end].
+    """
+    frames, chunks = [], []
+    ustart = cstart = 0
+    for part in parts:
+        for offset in range(0, len(part), FRAME_SIZE):
+            piece = part[offset:offset + FRAME_SIZE]
+            frame = compress(piece)
+            frames.append([ustart, ustart + len(piece), cstart, cstart + len(frame)])
+            chunks.append(frame)
+            ustart += len(piece)
+            cstart += len(frame)
+    return b"".join(chunks), frames
+
+def read_range(f, frames: list, start: int, end: int) -> bytes:
+    """Decompress only the frames overlapping [start, end) of the uncompressed stream held by file f."""
+    if start >= end:
+        return b""
+    first = max(bisect.bisect_right(frames, [start, float("inf")]) - 1, 0)
+    out = []
+    for ustart, uend, cstart, cend in frames[first:]:
+        if ustart >= end:
+            break
+        f.seek(cstart)
+        data = decompress(f.read(cend - cstart))
+        out.append(data[max(start - ustart, 0):min(end, uend) - ustart])
+    return b"".join(out)
+
+# JSON DOCUMENTS
+
+def dump_json(data) -> bytes:
+    return compress(serialization.dumps(data))
+
+def load_json(path: Path):
+    """Stream-decompress and parse a compressed JSON document."""
+    with open(path, "rb") as f:
+        header = f.read(18) # maximum zstd frame header size
+        f.seek(0)
+        with _decompressor(header).stream_reader(f) as reader:
+            return serialization.loads(reader.read())
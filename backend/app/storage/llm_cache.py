@@ -0,0 +1,152 @@
+# backend/app/storage/llm_cache.py
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from pathlib import Path
+from typing import Optional
+
+from langchain_core.caches import BaseCache, RETURN_VAL_TYPE
+from langchain_core.load import dumps as lc_dumps, loads as lc_loads
+
+from backend.app.storage import serialization
+
+# LLM responses cached on disk, keyed by everything that determines the answer (deployment,
+# prompts, temperature, max_tokens): retried details requests, regenerated dashboards and
+# repeated prompts are answered without calling Azure. Entries expire after PLEIADE_LLM_CACHE_TTL
+# seconds and the least recently used ones are dropped above PLEIADE_LLM_CACHE_MAX_ENTRIES.
+# Calls above PLEIADE_LLM_CACHE_MAX_TEMPERATURE (creative prompts: tweets, TikTok scripts) bypass
+# the cache, they are expected to give a different answer each time; call_llm(..., cache=False) bypasses
+# it for a single call. PLEIADE_LLM_CACHE=off disables it.
+LLM_CACHE_ENABLED = os.getenv("PLEIADE_LLM_CACHE", "on").lower() not in ("0", "off", "false")
+LLM_CACHE_PATH = Path(os.getenv("PLEIADE_LLM_CACHE_PATH", "backend/app/storage/llm_cache.db"))
+LLM_CACHE_TTL = float(os.getenv("PLEIADE_LLM_CACHE_TTL", str(30 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("PLEIADE_LLM_CACHE_MAX_ENTRIES", "20000"))
+LLM_CACHE_MAX_TEMPERATURE = float(os.getenv("PLEIADE_LLM_CACHE_MAX_TEMPERATURE", "0.5"))
+EVICT_EVERY = 100 # stores between two eviction passes
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed);
+"""
+
+_local = threading.local()
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "bypassed": 0, "stores": 0, "evicted": 0}
+
+def _connection() -> sqlite3.Connection:
+    """One connection per thread, schema created on first use."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        LLM_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(LLM_CACHE_PATH, timeout=30, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        _local.conn = conn
+    return conn
+
+def _count(name: str, n: int = 1):
+    with _lock:
+        _stats[name] += n
+
+def cache_key(*parts) -> str:
+    return hashlib.sha256(serialization.dumps(parts)).hexdigest()
+
+def use_cache(temperature: float, cache: bool = None) -> bool:
+    """Whether a call is cached: cache=True/False forces it, otherwise only low temperature calls are."""
+    if not LLM_CACHE_ENABLED or cache is False:
+        return False
+    return cache or temperature <= LLM_CACHE_MAX_TEMPERATURE
+
+def lookup(key: str) -> Optional[str]:
+    """Cached response, or None (missing or expired)."""
+    conn = _connection()
+    now = time.time()
+    row = conn.execute("SELECT value, created FROM responses WHERE key = ?", (key,)).fetchone()
+    if row is None or now - row[1] > LLM_CACHE_TTL:
+        _count("misses")
+        return None
+    conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+    _count("hits")
+    return row[0]
+
+def store(key: str, value: str):
+    now = time.time()
+    _connection().execute(
+        "INSERT OR REPLACE INTO responses (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+        (key, value, now, now)
+    )
+    _count("stores")
+    if _stats["stores"] % EVICT_EVERY == 0:
+        evict()
+
+def evict():
+    """Drop expired entries, then the least recently used ones above LLM_CACHE_MAX_ENTRIES."""
+    conn = _connection()
+    evicted = conn.execute("DELETE FROM responses WHERE created < ?", (time.time() - LLM_CACHE_TTL,)).rowcount
+    evicted += conn.execute(
+        "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+        (LLM_CACHE_MAX_ENTRIES,)
+    ).rowcount
+    if evicted:
+        _count("evicted", evicted)
+        print(f"[LLM_CACHE] Evicted {evicted} responses.")
+
+def clear():
+    _connection().execute("DELETE FROM responses")
+
+def cache_stats() -> dict:
+    with _lock:
+        stats = dict(_stats)
+    calls = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = round(stats["hits"] / calls, 3) if calls else 0.0
+    stats["enabled"] = LLM_CACHE_ENABLED
+    if LLM_CACHE_ENABLED:
+        stats["entries"] = _connection().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+    return stats
+
+def cached_call(key_parts: tuple, temperature: float, call, cache: bool = None) -> str:
+    """Response of call() for the prompt described by key_parts, from the cache when possible."""
+    if not use_cache(temperature, cache):
+        _count("bypassed")
+        return call()
+    key = cache_key(*key_parts)
+    response = lookup(key)
+    if response is None:
+        response = call()
+        if response is not None:
+            store(key, response)
+    return response
+
+class LLMResponseCache(BaseCache):
+    """Same cache for LangChain models: AzureChatOpenAI(..., cache=llm_response_cache). The model
+    parameters (deployment, temperature, max_tokens, ...) are part of LangChain's llm_string."""
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        if not LLM_CACHE_ENABLED:
+            return None
+        value = lookup(cache_key("langchain", llm_string, prompt))
+        return None if value is None else [lc_loads(g) for g in serialization.loads(value)]
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE):
+        if LLM_CACHE_ENABLED:
+            value = serialization.dumps([lc_dumps(g) for g in return_val]).decode("utf-8")
+            store(cache_key("langchain", llm_string, prompt), value)
+
+    def clear(self, **kwargs):
+        clear()
+
+llm_response_cache = LLMResponseCache()
+
+def langchain_cache(temperature: float):
+    """Value for the cache parameter of a LangChain model created with this temperature."""
+    return llm_response_cache if use_cache(temperature) else False
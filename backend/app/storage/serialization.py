@@ -0,0 +1,29 @@
+# backend/app/storage/serialization.py
+
+import orjson
+
+from pathlib import Path
+
+# Shared JSON layer for storage, dashboards and routers. orjson parses and encodes several
+# times faster than the stdlib and writes UTF-8 directly (same output as ensure_ascii=False).
+# Parse errors raise orjson.JSONDecodeError, a subclass of json.JSONDecodeError.
+JSONDecodeError = orjson.JSONDecodeError
+
+_DUMP_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+def loads(data):
+    """Parse JSON from bytes or str."""
+    return orjson.loads(data)
+
+def dumps(obj, pretty: bool = False) -> bytes:
+    """Encode to compact UTF-8 JSON bytes (indented when pretty, for files meant to be read by hand)."""
+    return orjson.dumps(obj, option=_DUMP_OPTIONS | (orjson.OPT_INDENT_2 if pretty else 0))
+
+def load_file(path) -> object:
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
+
+def dump_file(path, obj, pretty: bool = False):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(dumps(obj, pretty))
@@ -0,0 +1,320 @@
+# backend/app/storage/sqlite_store.py
+
+import os
+import sqlite3
+import threading
+
+from contextlib import contextmanager
+from pathlib import Path
+
+from backend.app.storage import serialization
+
+SQLITE_PATH = Path(os.getenv("PLEIADE_SQLITE_PATH", "backend/app/storage/pleiade.db"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS books (
+    id TEXT PRIMARY KEY,
+    meta TEXT NOT NULL,
+    text TEXT NOT NULL DEFAULT '',
+    version INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    book_id TEXT NOT NULL,
+    chunk_id INTEGER NOT NULL,
+    chunk TEXT NOT NULL,
+    PRIMARY KEY (book_id, chunk_id)
+);
+CREATE TABLE IF NOT EXISTS book_details (
+    book_id TEXT NOT NULL,
+    section TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (book_id, section)
+);
+CREATE TABLE IF NOT EXISTS dashboard_scores (
+    chart TEXT NOT NULL,
+    name TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (chart, name)
+);
+CREATE TABLE IF NOT EXISTS chat_messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    book_id TEXT NOT NULL,
+    message TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_chat_messages_book ON chat_messages (book_id, id);
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS compressed_chapters (
+    key TEXT PRIMARY KEY,
+    text TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS chunk_summaries (
+    key TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS content_digests (
+    digest TEXT PRIMARY KEY,
+    book_id TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Columns added after the first release: (table, column, definition), added to older databases on connect
+MIGRATIONS = (
+    ("books", "version", "INTEGER NOT NULL DEFAULT 0"), # bumped on every meta write, see load_book_meta_version
+)
+
+# Marker row so that a book with empty details ({}) still "exists", like an empty book_<id>.json
+DETAILS_MARKER = "__exists__"
+
+def _dumps(value) -> str:
+    # Stored as TEXT so the columns stay readable from the sqlite3 shell
+    return serialization.dumps(value).decode("utf-8")
+
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized = False
+
+def _connect() -> sqlite3.Connection:
+    SQLITE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(SQLITE_PATH, timeout=30, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=30000")
+    return conn
+
+def get_connection() -> sqlite3.Connection:
+    """One connection per thread, schema created on first use."""
+    global _initialized
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = _connect()
+        _local.conn = conn
+    if not _initialized:
+        with _init_lock:
+            if not _initialized:
+                conn.executescript(SCHEMA)
+                _migrate(conn)
+                _initialized = True
+    return conn
+
+def _migrate(conn: sqlite3.Connection):
+    for table, column, definition in MIGRATIONS:
+        columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if column not in columns:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+@contextmanager
+def transaction():
+    """BEGIN IMMEDIATE ... COMMIT, ROLLBACK on error. Nested calls join the outer transaction."""
+    conn = get_connection()
+    if conn.in_transaction:
+        yield conn
+        return
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    else:
+        conn.execute("COMMIT")
+
+def is_empty() -> bool:
+    conn = get_connection()
+    return conn.execute("SELECT 1 FROM books LIMIT 1").fetchone() is None
+
+def load_meta_value(key: str):
+    """Value stored for key in the database's own meta table (e.g. "imported"), or None."""
+    row = get_connection().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+def save_meta_value(key: str, value: str):
+    with transaction() as conn:
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+# BOOKS
+
+def load_catalog() -> list:
+    rows = get_connection().execute("SELECT meta FROM books ORDER BY rowid").fetchall()
+    return [serialization.loads(meta) for (meta,) in rows]
+
+def save_book(meta: dict, text: str, chunks: list) -> int:
+    """Insert or replace a book. Returns the new version of its meta."""
+    with transaction() as conn:
+        conn.execute(
+            "INSERT INTO books (id, meta, text) VALUES (?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET meta = excluded.meta, text = excluded.text, version = version + 1",
+            (meta["id"], _dumps(meta), text)
+        )
+        conn.execute("DELETE FROM chunks WHERE book_id = ?", (meta["id"],))
+        conn.executemany(
+            "INSERT INTO chunks (book_id, chunk_id, chunk) VALUES (?, ?, ?)",
+            [(meta["id"], chunk.get("chunk_id", i), _dumps(chunk)) for i, chunk in enumerate(chunks)]
+        )
+        return conn.execute("SELECT version FROM books WHERE id = ?", (meta["id"],)).fetchone()[0]
+
+def load_catalog_page(cursor: str, limit: int):
+    """Returns (entries after the cursor book, whether more entries follow)."""
+    conn = get_connection()
+    start = 0
+    if cursor is not None:
+        row = conn.execute("SELECT rowid FROM books WHERE id = ?", (cursor,)).fetchone()
+        if row is None:
+            raise ValueError(f"Unknown cursor {cursor}")
+        start = row[0]
+    rows = conn.execute(
+        "SELECT meta FROM books WHERE rowid > ? ORDER BY rowid LIMIT ?", (start, limit + 1)
+    ).fetchall()
+    return [serialization.loads(meta) for (meta,) in rows[:limit]], len(rows) > limit
+
+def update_book_meta(book_id: str, fields: dict):
+    """Merge fields into the stored meta of a book. Returns (meta, version), or None for unknown books."""
+    with transaction() as conn:
+        row = conn.execute("SELECT meta, version FROM books WHERE id = ?", (book_id,)).fetchone()
+        if row is None:
+            return None
+        meta, version = dict(serialization.loads(row[0]), **fields), row[1] + 1
+        conn.execute("UPDATE books SET meta = ?, version = ? WHERE id = ?", (_dumps(meta), version, book_id))
+    return meta, version
+
+def load_book_meta(book_id: str):
+    row = get_connection().execute("SELECT meta FROM books WHERE id = ?", (book_id,)).fetchone()
+    return serialization.loads(row[0]) if row else None
+
+def load_book_meta_version(book_id: str):
+    """Version of the meta of a book (any process writing it bumps it), or None for unknown books."""
+    row = get_connection().execute("SELECT version FROM books WHERE id = ?", (book_id,)).fetchone()
+    return row[0] if row else None
+
+def load_book_text(book_id: str, max_chars: int = None):
+    if max_chars is not None:
+        row = get_connection().execute("SELECT substr(text, 1, ?) FROM books WHERE id = ?", (max_chars, book_id)).fetchone()
+    else:
+        row = get_connection().execute("SELECT text FROM books WHERE id = ?", (book_id,)).fetchone()
+    return row[0] if row else None
+
+def load_book_chunks(book_id: str) -> list:
+    rows = get_connection().execute(
+        "SELECT chunk FROM chunks WHERE book_id = ? ORDER BY chunk_id", (book_id,)
+    ).fetchall()
+    return [serialization.loads(chunk) for (chunk,) in rows]
+
+# BOOK DETAILS
+
+def save_book_details(book_id: str, book_data: dict):
+    with transaction() as conn:
+        conn.execute("DELETE FROM book_details WHERE book_id = ?", (book_id,))
+        rows = [(book_id, DETAILS_MARKER, "null")]
+        rows += [(book_id, section, _dumps(value)) for section, value in book_data.items()]
+        conn.executemany("INSERT INTO book_details (book_id, section, data) VALUES (?, ?, ?)", rows)
+
+def update_book_details(book_id: str, sections: dict):
+    rows = [(book_id, DETAILS_MARKER, "null")]
+    rows += [(book_id, section, _dumps(value)) for section, value in sections.items()]
+    with transaction() as conn:
+        conn.executemany("INSERT OR REPLACE INTO book_details (book_id, section, data) VALUES (?, ?, ?)", rows)
+
+def load_book_details(book_id: str):
+    rows = get_connection().execute(
+        "SELECT section, data FROM book_details WHERE book_id = ?", (book_id,)
+    ).fetchall()
+    if not rows:
+        return None
+    return {section: serialization.loads(data) for section, data in rows if section != DETAILS_MARKER}
+
+# DASHBOARD
+
+def save_scores(chart: str, name: str, scores):
+    with transaction() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO dashboard_scores (chart, name, data) VALUES (?, ?, ?)",
+            (chart, name, _dumps(scores))
+        )
+
+def load_scores(chart: str, name: str):
+    row = get_connection().execute(
+        "SELECT data FROM dashboard_scores WHERE chart = ? AND name = ?", (chart, name)
+    ).fetchone()
+    return serialization.loads(row[0]) if row else None
+
+def copy_scores(source_suffix: str, target_suffix: str) -> int:
+    """Copy every score whose name ends with source_suffix, renamed to end with target_suffix."""
+    with transaction() as conn:
+        rows = conn.execute(
+            "SELECT chart, name, data FROM dashboard_scores WHERE substr(name, -?) = ?",
+            (len(source_suffix), source_suffix)
+        ).fetchall()
+        conn.executemany(
+            "INSERT OR REPLACE INTO dashboard_scores (chart, name, data) VALUES (?, ?, ?)",
+            [(chart, name[:-len(source_suffix)] + target_suffix, data) for chart, name, data in rows]
+        )
+    return len(rows)
+
+# CHAT HISTORY
+
+def load_chat_messages(book_id: str) -> list:
+    rows = get_connection().execute(
+        "SELECT message FROM chat_messages WHERE book_id = ? ORDER BY id", (book_id,)
+    ).fetchall()
+    return [serialization.loads(message) for (message,) in rows]
+
+def append_chat_message(book_id: str, message: dict):
+    with transaction() as conn:
+        conn.execute(
+            "INSERT INTO chat_messages (book_id, message) VALUES (?, ?)",
+            (book_id, _dumps(message))
+        )
+
+def clear_chat_messages(book_id: str):
+    with transaction() as conn:
+        conn.execute("DELETE FROM chat_messages WHERE book_id = ?", (book_id,))
+
+# INGESTION JOBS
+
+def save_job(job: dict):
+    with transaction() as conn:
+        conn.execute("INSERT OR REPLACE INTO jobs (id, data) VALUES (?, ?)", (job["id"], _dumps(job)))
+
+def load_job(job_id: str):
+    row = get_connection().execute("SELECT data FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    return serialization.loads(row[0]) if row else None
+
+# COMPRESSION CACHE
+
+def save_compressed_chapter(key: str, text: str):
+    with transaction() as conn:
+        conn.execute("INSERT OR REPLACE INTO compressed_chapters (key, text) VALUES (?, ?)", (key, text))
+
+def load_compressed_chapter(key: str):
+    row = get_connection().execute("SELECT text FROM compressed_chapters WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+def delete_scores(suffix: str) -> int:
+    with transaction() as conn:
+        return conn.execute("DELETE FROM dashboard_scores WHERE substr(name, -?) = ?", (len(suffix), suffix)).rowcount
+
+# CHUNK SUMMARIES
+
+def save_chunk_summary(key: str, summary: dict):
+    with transaction() as conn:
+        conn.execute("INSERT OR REPLACE INTO chunk_summaries (key, data) VALUES (?, ?)", (key, _dumps(summary)))
+
+def load_chunk_summary(key: str):
+    row = get_connection().execute("SELECT data FROM chunk_summaries WHERE key = ?", (key,)).fetchone()
+    return serialization.loads(row[0]) if row else None
+
+# CONTENT DIGESTS
+
+def save_content_digest(digest: str, book_id: str):
+    with transaction() as conn:
+        conn.execute("INSERT OR REPLACE INTO content_digests (digest, book_id) VALUES (?, ?)", (digest, book_id))
+
+def load_content_digest(digest: str):
+    row = get_connection().execute("SELECT book_id FROM content_digests WHERE digest = ?", (digest,)).fetchone()
+    return row[0] if row else None
@@ -1,24 +1,560 @@
-import json
+import fcntl
+import mmap
 import os
+import tempfile
+import threading
 
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
 from fastapi import HTTPException
 
-BOOKS_UPLOADPAGE_FILE = Path("backend/app/storage/books_overview.json")
+from backend.app.storage import compression, serialization, sqlite_store, thema_index
+
+BOOKS_UPLOADPAGE_FILE = Path("backend/app/storage/books_overview.json") # legacy monolithic file, migrated on first access
+CATALOG_FILE = Path("backend/app/storage/catalog.jsonl")
+CATALOG_LOCK_FILE = Path("backend/app/storage/catalog.lock")
+LEGACY_CATALOG_FILE = Path("backend/app/storage/catalog.json")
+MANUSCRIPTS_PATH = Path("backend/app/storage/manuscripts")
 STORAGE_PATH = Path("backend/app/storage/books")
+DASHBOARDS_PATH = Path("backend/app/storage/dashboards")
+CHAT_HISTORY_PATH = Path("backend/app/storage/chat_history")
+UPLOADS_PATH = Path("backend/app/storage/uploads")
+JOBS_PATH = Path("backend/app/storage/jobs")
+COMPRESSION_CACHE_PATH = Path("backend/app/storage/compression_cache")
+CONTENT_INDEX_PATH = Path("backend/app/storage/content_index")
+SUMMARY_CACHE_PATH = Path("backend/app/storage/summary_cache")
+
+# "files" (JSON files, default) or "sqlite" (single transactional database, see sqlite_store.py)
+STORAGE_ENGINE = os.getenv("PLEIADE_STORAGE_ENGINE", "files").lower()
+
+# Catalog layout:
+#   catalog.jsonl                 -> append-only index, one metadata line per save (last line wins per id)
+#   manuscripts/<id>/meta.json    -> metadata of a single book (title, author, pages, ...)
+#   manuscripts/<id>/text.bin     -> UTF-8 blob: the manuscript text, then the chunk bodies
+#                                    (text.zst instead with PLEIADE_STORAGE_COMPRESSION=zstd: the same
+#                                    blob as independent zstd frames, listed in index.json)
+#   manuscripts/<id>/index.json   -> byte size of the text in the blob and (start, end) offsets of each chunk
+# (older shards may still hold a single content.json with text and chunks, it is read as a fallback)
+CONTENT_FIELDS = ("text", "chunks")
+
+def _manuscript_dir(book_id: str) -> Path:
+    return MANUSCRIPTS_PATH / str(book_id)
+
+def _write_json(path: Path, data, pretty: bool = False):
+    """Write to a temp file in the same folder then rename, so readers never see a partial file."""
+    _write_bytes(path, serialization.dumps(data, pretty))
+
+@contextmanager
+def _file_lock(lock_path: Path, exclusive: bool = True):
+    """Advisory flock, shared between threads and worker processes."""
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+def _split_book_record(book_data: dict):
+    meta = {k: v for k, v in book_data.items() if k not in CONTENT_FIELDS}
+    meta["chunk_count"] = len(book_data.get("chunks", []))
+    content = {
+        "text": book_data.get("text", ""),
+        "chunks": book_data.get("chunks", [])
+    }
+    return meta, content
+
+def _build_text_blob(text: str, chunks: list):
+    """Lay out the text blob parts and the offset index. Chunks found verbatim in the text point into it."""
+    text_bytes = text.encode("utf-8")
+    parts = [text_bytes]
+    size = len(text_bytes)
+    entries = []
+    for chunk in chunks:
+        chunk_text = chunk.get("chunk_text", "")
+        entry = {k: v for k, v in chunk.items() if k != "chunk_text"}
+        position = text.find(chunk_text) if chunk_text else -1
+        if position != -1:
+            start = len(text[:position].encode("utf-8"))
+            entry["start"], entry["end"] = start, start + len(chunk_text.encode("utf-8"))
+        else:
+            chunk_bytes = chunk_text.encode("utf-8")
+            entry["start"], entry["end"] = size, size + len(chunk_bytes)
+            parts.append(chunk_bytes)
+            size += len(chunk_bytes)
+        entries.append(entry)
+    return parts, {"text_bytes": len(text_bytes), "chunks": entries}
+
+# Process umask, read once (os.umask can only be read by setting it)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+def _file_mode(path: Path) -> int:
+    """Mode for a rewrite of path: the current one, or what open() would give a new file."""
+    try:
+        return path.stat().st_mode & 0o7777
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+def _write_bytes(path: Path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        os.fchmod(fd, _file_mode(path)) # mkstemp creates the file as 0600
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+def _remove_file(path: Path):
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+def _write_book_shard(book_data: dict) -> dict:
+    meta, content = _split_book_record(book_data)
+    folder = _manuscript_dir(book_data["id"])
+    parts, index = _build_text_blob(content["text"], content["chunks"])
+    if compression.enabled():
+        data, index["frames"] = compression.compress_parts(parts)
+        _write_bytes(folder / "text.zst", data)
+        _remove_file(folder / "text.bin")
+    else:
+        _write_bytes(folder / "text.bin", b"".join(parts))
+        _remove_file(folder / "text.zst")
+    _write_json(folder / "index.json", index)
+    _write_json(folder / "meta.json", meta)
+    return meta
+
+# CATALOG LOG
+# Uploads append a single line under an exclusive lock, so their cost does not depend on the
+# catalog size and parallel uploads cannot overwrite each other. Readers fold the log (last
+# line wins) and compact it once superseded lines outnumber live entries.
+CATALOG_COMPACTION_MIN_GARBAGE = 64
+
+def _catalog_lock(exclusive: bool):
+    return _file_lock(CATALOG_LOCK_FILE, exclusive)
+
+def _parse_catalog_lines(lines, entries: dict) -> int:
+    """Fold raw log lines into entries (last line wins). Returns the number of non-empty lines."""
+    count = 0
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        count += 1
+        try:
+            meta = serialization.loads(line)
+        except serialization.JSONDecodeError:
+            print(f"[STORAGE] Skipping corrupted catalog line: {line[:80]!r}")
+            continue
+        entries[meta["id"]] = meta
+    return count
+
+def _read_catalog_log():
+    """Return ({book_id: meta} in first-seen order, number of log lines). Caller holds the lock."""
+    entries = {}
+    if not CATALOG_FILE.exists():
+        return entries, 0
+    with open(CATALOG_FILE, "rb") as f:
+        return entries, _parse_catalog_lines(f, entries)
+
+def _write_catalog_log(entries: list):
+    """Atomically replace the log with one line per entry. Caller holds the exclusive lock."""
+    tmp_path = CATALOG_FILE.with_name(CATALOG_FILE.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        for meta in entries:
+            f.write(serialization.dumps(meta) + b"\n")
+    os.replace(tmp_path, CATALOG_FILE)
+
+def _append_catalog_entry(meta: dict):
+    line = serialization.dumps(meta) + b"\n"
+    with _catalog_lock(exclusive=True):
+        fd = os.open(CATALOG_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+def compact_catalog():
+    """Rewrite the catalog log keeping only the latest line of each book."""
+    with _catalog_lock(exclusive=True):
+        entries, lines = _read_catalog_log()
+        _write_catalog_log(list(entries.values()))
+    print(f"[STORAGE] Compacted catalog: {lines} lines -> {len(entries)} entries.")
+
+def _migrate_books_overview():
+    """Split the legacy books_overview.json into one shard per book plus the catalog index."""
+    print(f"[STORAGE] Migrating {BOOKS_UPLOADPAGE_FILE} to sharded catalog...")
+    books = serialization.load_file(BOOKS_UPLOADPAGE_FILE)
+
+    catalog = [_write_book_shard(book) for book in books if isinstance(book, dict) and "id" in book]
+    _write_catalog_log(catalog)
+    print(f"[STORAGE] Migrated {len(catalog)} books.")
+
+def _ensure_catalog():
+    if CATALOG_FILE.exists():
+        return
+    with _catalog_lock(exclusive=True):
+        if CATALOG_FILE.exists():
+            return
+        if LEGACY_CATALOG_FILE.exists():
+            _write_catalog_log(serialization.load_file(LEGACY_CATALOG_FILE))
+        elif BOOKS_UPLOADPAGE_FILE.exists():
+            _migrate_books_overview()
+
+# CATALOG SNAPSHOT
+# The folded catalog is kept in memory between requests. Since the log is append-only, a refresh
+# only parses the bytes appended since the previous one; a compaction replaces the file (new
+# inode) and triggers a full reload. Book order is the first-seen order of the log.
+_catalog_state = {"inode": None, "offset": 0, "lines": 0, "entries": {}, "order": [], "positions": {}}
+_catalog_state_lock = threading.Lock()
+
+def _refresh_catalog_state() -> dict:
+    """Bring the snapshot up to date with the log. Caller holds _catalog_state_lock."""
+    state = _catalog_state
+    with _catalog_lock(exclusive=False):
+        try:
+            stat = CATALOG_FILE.stat()
+        except FileNotFoundError:
+            stat = None
+        inode = (stat.st_dev, stat.st_ino) if stat else None
+        if inode != state["inode"] or (stat and stat.st_size < state["offset"]):
+            state.update(inode=inode, offset=0, lines=0, entries={}, order=[], positions={})
+        if stat is None or stat.st_size == state["offset"]:
+            return state
+        with open(CATALOG_FILE, "rb") as f:
+            f.seek(state["offset"])
+            data = f.read()
+
+    added = {}
+    state["lines"] += _parse_catalog_lines(data.splitlines(), added)
+    state["offset"] += len(data)
+    for book_id, meta in added.items():
+        if book_id not in state["positions"]:
+            state["positions"][book_id] = len(state["order"])
+            state["order"].append(book_id)
+        state["entries"][book_id] = meta
+    return state
+
+def _compact_catalog_if_needed(lines: int, entries: int):
+    if lines - entries > max(CATALOG_COMPACTION_MIN_GARBAGE, entries):
+        compact_catalog()
+
+# BOOK METADATA CACHE
+# Title, author, pages and chunk count are read on every chat turn, so they are kept in a
+# bounded LRU. Entries are validated against the version of the stored meta, which also catches
+# writes from other processes (ingestion workers, other uvicorn workers): the mtime of meta.json
+# for the file engine, the version column of the books table for SQLite.
+BOOK_META_CACHE_SIZE = int(os.getenv("PLEIADE_BOOK_META_CACHE_SIZE", "1024"))
+
+_book_meta_cache = OrderedDict() # book_id -> (version, meta)
+_book_meta_cache_lock = threading.Lock()
+
+def _book_meta_version(book_id: str):
+    if _use_sqlite():
+        return sqlite_store.load_book_meta_version(book_id)
+    try:
+        return (_manuscript_dir(book_id) / "meta.json").stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+def _cache_book_meta(book_id: str, meta: dict, version=None):
+    if version is None:
+        version = _book_meta_version(book_id)
+    with _book_meta_cache_lock:
+        _book_meta_cache[book_id] = (version, meta)
+        _book_meta_cache.move_to_end(book_id)
+        while len(_book_meta_cache) > BOOK_META_CACHE_SIZE:
+            _book_meta_cache.popitem(last=False)
+
+def _load_book_meta(book_id: str) -> dict:
+    version = _book_meta_version(book_id)
+    with _book_meta_cache_lock:
+        cached = _book_meta_cache.get(book_id)
+        if cached is not None and cached[0] == version:
+            _book_meta_cache.move_to_end(book_id)
+            return cached[1]
+
+    meta = _read_book_meta(book_id)
+    _cache_book_meta(book_id, meta, version) # version taken before the read, a concurrent write invalidates it
+    return meta
+
+def _read_book_meta(book_id: str) -> dict:
+    if _use_sqlite():
+        meta = sqlite_store.load_book_meta(book_id)
+        if meta is None:
+            raise ValueError(f"No book found with ID {book_id}")
+        return meta
+    _ensure_catalog()
+    path = _manuscript_dir(book_id) / "meta.json"
+    if not path.exists():
+        raise ValueError(f"No book found with ID {book_id}")
+    return serialization.load_file(path)
+
+# TEXT BLOB
+# The blob is memory-mapped: readers decode only the byte ranges they need (one chunk, the
+# first N characters of the manuscript, ...) instead of parsing the whole book.
+
+def _load_legacy_content(book_id: str) -> dict:
+    path = _manuscript_dir(book_id) / "content.json"
+    if not path.exists():
+        raise ValueError(f"No book found with ID {book_id}")
+    return serialization.load_file(path)
+
+def _load_blob_index(book_id: str):
+    """Return the blob index, or None when the shard predates the blob layout."""
+    _ensure_catalog()
+    path = _manuscript_dir(book_id) / "index.json"
+    if not path.exists():
+        return None
+    return serialization.load_file(path)
+
+@contextmanager
+def _open_text_blob(book_id: str, index: dict):
+    """Yield read(start, end) -> bytes over the blob: an mmap slice, or the matching zstd frames."""
+    if "frames" in index:
+        with open(_manuscript_dir(book_id) / "text.zst", "rb") as f:
+            yield lambda start, end: compression.read_range(f, index["frames"], start, end)
+        return
+    with open(_manuscript_dir(book_id) / "text.bin", "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield lambda start, end: b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as blob:
+            yield lambda start, end: blob[start:end]
+
+def _decode_slice(read, start: int, end: int, max_chars: int = None) -> str:
+    if max_chars is not None:
+        end = min(end, start + 4 * max_chars) # a UTF-8 character is at most 4 bytes
+        return read(start, end).decode("utf-8", errors="ignore")[:max_chars]
+    return read(start, end).decode("utf-8")
+
+def _read_book_text(book_id: str, max_chars: int = None) -> str:
+    index = _load_blob_index(book_id)
+    if index is None:
+        text = _load_legacy_content(book_id).get("text", "")
+        return text if max_chars is None else text[:max_chars]
+    with _open_text_blob(book_id, index) as read:
+        return _decode_slice(read, 0, index["text_bytes"], max_chars)
+
+def _read_book_chunks(book_id: str, max_chars: int = None) -> list:
+    index = _load_blob_index(book_id)
+    if index is None:
+        chunks = _load_legacy_content(book_id).get("chunks", [])
+        if max_chars is not None:
+            chunks = [{**chunk, "chunk_text": chunk.get("chunk_text", "")[:max_chars]} for chunk in chunks]
+        return chunks
+    chunks = []
+    with _open_text_blob(book_id, index) as read:
+        for entry in index["chunks"]:
+            chunk = {k: v for k, v in entry.items() if k not in ("start", "end")}
+            chunk["chunk_text"] = _decode_slice(read, entry["start"], entry["end"], max_chars)
+            chunks.append(chunk)
+    return chunks
+
+def _load_book_content(book_id: str) -> dict:
+    return {"text": _read_book_text(book_id), "chunks": _read_book_chunks(book_id)}
+
+def _load_details_file(path: Path) -> dict:
+    if path.suffix == ".zst":
+        return compression.load_json(path)
+    return serialization.load_file(path)
+
+def _details_file(book_id: str):
+    """Path of the stored details of a book (compressed or not), None when there is none."""
+    for path in (STORAGE_PATH / f"book_{book_id}.json.zst", STORAGE_PATH / f"book_{book_id}.json"):
+        if path.exists():
+            return path
+    return None
+
+def _write_details_file(book_id: str, book_data: dict):
+    path = STORAGE_PATH / f"book_{book_id}.json"
+    if compression.enabled():
+        _write_bytes(path.with_name(path.name + ".zst"), compression.dump_json(book_data))
+        _remove_file(path)
+    else:
+        _write_json(path, book_data)
+        _remove_file(path.with_name(path.name + ".zst"))
+
+# SQLITE ENGINE
+
+_sqlite_ready = False
+_sqlite_init_lock = threading.Lock()
+
+def _use_sqlite() -> bool:
+    """Return True when the SQLite engine is selected, importing the JSON files on its first use."""
+    global _sqlite_ready
+    if STORAGE_ENGINE != "sqlite":
+        return False
+    if not _sqlite_ready:
+        with _sqlite_init_lock:
+            if not _sqlite_ready:
+                _import_files_into_sqlite()
+                _sqlite_ready = True
+    return True
+
+def _import_files_into_sqlite():
+    """
+    Copy the JSON storage into the database, once: in a single transaction that also sets the
+    "imported" marker, so a failed or concurrent import (another worker) leaves no partial copy.
+    """
+    if sqlite_store.load_meta_value("imported") is not None:
+        return
+    with sqlite_store.transaction():
+        if sqlite_store.load_meta_value("imported") is not None: # imported by another process meanwhile
+            return
+        if not sqlite_store.is_empty(): # imported before the marker existed, do not overwrite newer data
+            sqlite_store.save_meta_value("imported", "1")
+            return
+        _copy_files_into_sqlite()
+        sqlite_store.save_meta_value("imported", "1")
+
+def _copy_files_into_sqlite():
+    print(f"[STORAGE] Importing JSON storage into {sqlite_store.SQLITE_PATH}...")
+    _ensure_catalog()
+    with _catalog_lock(exclusive=False):
+        entries, _ = _read_catalog_log()
+    for meta in entries.values():
+        content = _load_book_content(meta["id"])
+        sqlite_store.save_book(meta, content.get("text", ""), content.get("chunks", []))
+
+    for path in sorted(STORAGE_PATH.glob("book_*.json*")):
+        book_id = path.name[len("book_"):].split(".json")[0]
+        sqlite_store.save_book_details(book_id, _load_details_file(path))
+
+    for chart_dir in sorted(p for p in DASHBOARDS_PATH.glob("*") if p.is_dir()):
+        for path in sorted(chart_dir.glob("*.json")):
+            sqlite_store.save_scores(chart_dir.name, path.name, serialization.load_file(path))
+
+    for path in sorted(CHAT_HISTORY_PATH.glob("session_*.json")):
+        book_id = path.stem[len("session_"):]
+        sqlite_store.clear_chat_messages(book_id) # appended messages would be duplicated by a second import
+        for message in serialization.load_file(path):
+            sqlite_store.append_chat_message(book_id, message)
+    print("[STORAGE] Import complete.")
 
 # UPLOAD PAGE METHODS
+# The upload page lists books through a projection of the catalog: a fixed set of small fields
+# (hasDetails is materialized on the entry when details are saved), served page by page.
+# Listing never writes: entries saved before the flag existed get it computed on each read,
+# until their details are saved again.
+CATALOG_FIELDS = ("id", "title", "author", "cover", "uploadDate", "pages", "hasDetails")
+CATALOG_PAGE_SIZE = 50
+CATALOG_MAX_PAGE_SIZE = 500
+DETAILS_SECTIONS = ("analysis", "overview", "marketing")
+
+def load_catalog() -> list:
+    """Lightweight listing of every book: metadata only, no text nor chunks."""
+    if _use_sqlite():
+        return sqlite_store.load_catalog()
+    _ensure_catalog()
+    with _catalog_state_lock:
+        state = _refresh_catalog_state()
+        entries = [dict(state["entries"][book_id]) for book_id in state["order"]]
+        lines = state["lines"]
+    _compact_catalog_if_needed(lines, len(entries))
+    return entries
+
+def load_catalog_page(cursor: str = None, limit: int = CATALOG_PAGE_SIZE, fields=None) -> dict:
+    """
+    One page of the catalog projection, starting after the book id given as cursor.
+    Returns {"items": [...], "next_cursor": id of the last item, or None on the last page}.
+    Raises ValueError for an unknown cursor or field.
+    """
+    fields = _catalog_fields(fields)
+    limit = max(1, min(int(limit), CATALOG_MAX_PAGE_SIZE))
+    if _use_sqlite():
+        entries, has_more = sqlite_store.load_catalog_page(cursor, limit)
+    else:
+        _ensure_catalog()
+        with _catalog_state_lock:
+            state = _refresh_catalog_state()
+            start = 0
+            if cursor is not None:
+                if cursor not in state["positions"]:
+                    raise ValueError(f"Unknown cursor {cursor}")
+                start = state["positions"][cursor] + 1
+            page_ids = state["order"][start:start + limit]
+            entries = [dict(state["entries"][book_id]) for book_id in page_ids]
+            has_more = start + limit < len(state["order"])
+            lines, count = state["lines"], len(state["entries"])
+        _compact_catalog_if_needed(lines, count)
+
+    for entry in entries:
+        if "hasDetails" not in entry: # entries written before the flag existed
+            entry["hasDetails"] = _has_details(_find_book_details(entry["id"]))
+
+    items = [_project_catalog_entry(entry, fields) for entry in entries]
+    return {"items": items, "next_cursor": items[-1]["id"] if has_more and items else None}
+
+def _catalog_fields(fields) -> tuple:
+    if not fields:
+        return CATALOG_FIELDS
+    unknown = set(fields) - set(CATALOG_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown catalog fields: {', '.join(sorted(unknown))}")
+    return ("id",) + tuple(field for field in CATALOG_FIELDS if field in fields and field != "id")
+
+def _project_catalog_entry(entry: dict, fields: tuple) -> dict:
+    return {field: entry.get(field, False if field == "hasDetails" else None) for field in fields}
+
+def _has_details(book_data) -> bool:
+    return bool(book_data) and all(section in book_data for section in DETAILS_SECTIONS)
+
+def _set_has_details(book_id: str, has_details: bool) -> bool:
+    """Materialize the hasDetails flag on the catalog entry of a book, when it changed."""
+    try:
+        meta = _load_book_meta(book_id)
+    except ValueError:
+        return has_details # details without a manuscript (demo data)
+    if meta.get("hasDetails") == has_details:
+        return has_details
+    if _use_sqlite():
+        updated = sqlite_store.update_book_meta(book_id, {"hasDetails": has_details}) # merged into the stored meta, not the cached one
+        if updated is not None:
+            _cache_book_meta(book_id, *updated)
+        return has_details
+    with _book_meta_lock(book_id): # read again under the lock: save_book may have written a new revision since
+        meta = dict(_read_book_meta(book_id), hasDetails=has_details)
+        _write_json(_manuscript_dir(book_id) / "meta.json", meta)
+        _append_catalog_entry(meta)
+    _cache_book_meta(book_id, meta)
+    return has_details
+
 def load_books():
-    if BOOKS_UPLOADPAGE_FILE.exists():
-        with open(BOOKS_UPLOADPAGE_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return ["Nope"]
+    books = []
+    for entry in load_catalog():
+        book = dict(entry)
+        book.pop("chunk_count", None)
+        book["chunks"] = load_book_chunks(entry["id"])
+        book["text"] = load_book_text(entry["id"])
+        books.append(book)
+    return books
 
 def save_book(book_data):
-    books = load_books()
-    books.append(book_data)
-    with open(BOOKS_UPLOADPAGE_FILE, "w", encoding="utf-8") as f:
-        json.dump(books, f, indent=4)
+    if _use_sqlite():
+        meta, content = _split_book_record(book_data)
+        version = sqlite_store.save_book(meta, content["text"], content["chunks"])
+        _cache_book_meta(book_data["id"], meta, version)
+        return
+    _ensure_catalog()
+    with _book_meta_lock(book_data["id"]):
+        meta = _write_book_shard(book_data) # shard first: a catalog line always points to a complete book
+        _append_catalog_entry(meta)
+    _cache_book_meta(book_data["id"], meta)
+
+def _book_meta_lock(book_id: str):
+    """Serializes the writes of a book's meta.json and catalog line (distinct from the details lock, held around them)."""
+    return _file_lock(STORAGE_PATH / f".meta_{book_id}.lock")
 
 def save_cover_image(book_id: str, cover_bytes: bytes) -> str:
     folder = "backend/app/storage/covers"
@@ -30,120 +566,163 @@ def save_cover_image(book_id: str, cover_bytes: bytes) -> str:
 
 # BOOK DETAILS METHODS
 
-def load_book_chunks(book_id: str) -> dict:
-    with open(BOOKS_UPLOADPAGE_FILE, "r", encoding="utf-8") as f:
-        books = json.load(f)
-
-    for book in books:
-        if book["id"] == book_id:
-            return book.get("chunks", [])
-
-    raise ValueError(f"No book found with ID {book_id}")
+def load_book_chunks(book_id: str) -> list:
+    if _use_sqlite():
+        _load_book_meta(book_id) # raises for unknown books
+        return sqlite_store.load_book_chunks(book_id)
+    return _read_book_chunks(book_id)
 
-def load_book_text(book_id: str) -> dict:
-    with open(BOOKS_UPLOADPAGE_FILE, "r", encoding="utf-8") as f:
-        books = json.load(f)
+def load_book_chunk_texts(book_id: str, max_chars: int = None) -> list:
+    """Chunk texts only, each optionally cut to its first max_chars characters."""
+    if _use_sqlite():
+        return [chunk["chunk_text"][:max_chars] if max_chars is not None else chunk["chunk_text"]
+                for chunk in load_book_chunks(book_id) if "chunk_text" in chunk]
+    return [chunk["chunk_text"] for chunk in _read_book_chunks(book_id, max_chars)]
 
-    for book in books:
-        if book["id"] == book_id:
-            return book.get("text", "")
+def load_book_text(book_id: str, max_chars: int = None) -> str:
+    """Manuscript text, optionally only its first max_chars characters."""
+    if _use_sqlite():
+        text = sqlite_store.load_book_text(book_id, max_chars)
+        if text is None:
+            raise ValueError(f"No book found with ID {book_id}")
+        return text
+    return _read_book_text(book_id, max_chars)
 
-    raise ValueError(f"No book found with ID {book_id}")
+def load_book_meta(book_id: str) -> dict:
+    """Catalog metadata of a book (title, author, cover, pages, revision, ...). Raises ValueError for unknown books."""
+    return dict(_load_book_meta(book_id))
 
-def load_book_title(book_id: str) -> dict:
-    with open(BOOKS_UPLOADPAGE_FILE, "r", encoding="utf-8") as f:
-        books = json.load(f)
+def load_book_title(book_id: str) -> str:
+    return _load_book_meta(book_id).get("title", "")
 
-    for book in books:
-        if book["id"] == book_id:
-            return book.get("title", "")
+def load_book_author(book_id: str) -> str:
+    return _load_book_meta(book_id).get("author", "")
 
-    raise ValueError(f"No book found with ID {book_id}")
+def load_book_pages(book_id: str) -> int:
+    return _load_book_meta(book_id).get("pages", "")
 
-def load_book_author(book_id: str) -> dict:
-    with open(BOOKS_UPLOADPAGE_FILE, "r", encoding="utf-8") as f:
-        books = json.load(f)
-
-    for book in books:
-        if book["id"] == book_id:
-            return book.get("author", "")
+def load_book_chunk_count(book_id: str) -> int:
+    meta = _load_book_meta(book_id)
+    if "chunk_count" not in meta:
+        return len(load_book_chunks(book_id))
+    return meta["chunk_count"]
+    
+def _book_details_lock(book_id: str):
+    return _file_lock(STORAGE_PATH / f".book_{book_id}.lock")
 
-    raise ValueError(f"No book found with ID {book_id}")
+def save_book_details(book_id: str, book_data: dict): #override
+    if _use_sqlite():
+        sqlite_store.save_book_details(book_id, book_data)
+        _set_has_details(book_id, _has_details(book_data))
+        return
+    with _book_details_lock(book_id):
+        _write_details_file(book_id, book_data)
+        _set_has_details(book_id, _has_details(book_data))
 
-def load_book_pages(book_id: str) -> dict:
-    with open(BOOKS_UPLOADPAGE_FILE, "r", encoding="utf-8") as f:
-        books = json.load(f)
+def update_book_details(book_id: str, sections: dict):
+    """Merge top-level sections into the stored details in one locked, atomic write."""
+    if _use_sqlite():
+        sqlite_store.update_book_details(book_id, sections)
+        _set_has_details(book_id, _has_details(sqlite_store.load_book_details(book_id)))
+        return
+    with _book_details_lock(book_id):
+        path = _details_file(book_id)
+        book_data = _load_details_file(path) if path else {}
+        book_data.update(sections)
+        _write_details_file(book_id, book_data)
+        _set_has_details(book_id, _has_details(book_data))
 
-    for book in books:
-        if book["id"] == book_id:
-            return book.get("pages", "")
+@contextmanager
+def book_details_session(book_id: str):
+    """
+    Unit of work over the details of a book: yields the details dict, and on exit flushes the
+    sections that were added or replaced with a single update_book_details call. Sections written
+    meanwhile by another request are kept. The flush also happens when the body raises, so
+    sections generated before the failure are not lost.
+    """
+    book_data = load_book_details(book_id)
+    snapshot = dict(book_data)
+    try:
+        yield book_data
+    finally:
+        changed = {
+            section: value
+            for section, value in book_data.items()
+            if section not in snapshot or snapshot[section] is not value
+        }
+        if changed:
+            update_book_details(book_id, changed)
 
-    raise ValueError(f"No book found with ID {book_id}")
-    
-def save_book_details(book_id: str, book_data: dict): #override
-    path = STORAGE_PATH / f"book_{book_id}.json"
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(book_data, f, indent=4, ensure_ascii=False)
+def _find_book_details(book_id: str):
+    if _use_sqlite():
+        return sqlite_store.load_book_details(book_id)
+    path = _details_file(book_id)
+    if path is None:
+        return None
+    return _load_details_file(path)
 
 def load_book_details(book_id: str) -> dict:
-    path = STORAGE_PATH / f"book_{book_id}.json"
-    if not path.exists():
+    book_data = _find_book_details(book_id)
+    if book_data is None:
         raise HTTPException(status_code=401, detail="Book details not found")
-    
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return book_data
     
 def get_book_path(book_id: str) -> str:
-    return os.path.join(STORAGE_PATH, f"book_{book_id}.json")
+    return str(_details_file(book_id) or STORAGE_PATH / f"book_{book_id}.json")
+
+def train_compression_dictionary(max_samples: int = 4000):
+    """
+    Train the zstd dictionary used for small records (chunk frames, short details) on the
+    current corpus. Run it once the catalog has a few books, e.g.:
+        python -c "from backend.app.storage.storage import train_compression_dictionary; train_compression_dictionary()"
+    """
+    samples = []
+    for entry in load_catalog():
+        samples += [text.encode("utf-8") for text in load_book_chunk_texts(entry["id"])]
+        samples.append(serialization.dumps(entry))
+    for path in STORAGE_PATH.glob("book_*.json*"):
+        samples.append(serialization.dumps(_load_details_file(path)))
+    return compression.train_dictionary(samples[:max_samples])
 
 # BOOKS OVERVIEW METHODS
 
+@lru_cache(maxsize=None)
+def _load_letter_prompts(file_path: str) -> dict:
+    return serialization.load_file(file_path)
+
 def get_2nd_letter_prompt(primary_thema_code):
     file_path = "backend/app/storage/thema_codes/2nd_letter_prompts.json"
     try:
-        with open(file_path, "r") as f:
-            prompts = json.load(f)
+        prompts = _load_letter_prompts(file_path)
         return prompts.get(primary_thema_code.strip().upper(), f"No prompt found for code '{primary_thema_code}'")
     except FileNotFoundError:
         return f"File '{file_path}' not found."
-    except json.JSONDecodeError:
+    except serialization.JSONDecodeError:
         return "Error reading JSON file. Please ensure it is properly formatted."
     
 def get_3rd_letter_prompt(second_letter):
     file_path = "backend/app/storage/thema_codes/3rd_letter_prompts.json"
     try:
-        with open(file_path, "r") as f:
-            prompts = json.load(f)
+        prompts = _load_letter_prompts(file_path)
         return prompts.get(second_letter.strip().upper(), f"No prompt found for 2nd letter '{second_letter}'")
     except FileNotFoundError:
         return f"File '{file_path}' not found."
-    except json.JSONDecodeError:
+    except serialization.JSONDecodeError:
         return "Error reading JSON file. Please ensure it is properly formatted."
     
 def get_thema_code_desc(code_value):
-    file_path = "backend/app/storage/thema_codes/thema_codes.json"
     try:
-        with open(file_path, "r") as f:
-            thema_json = json.load(f)
+        return thema_index.get_description(code_value)
     except FileNotFoundError:
-        return f"File '{file_path}' not found."
-    except json.JSONDecodeError:
+        return f"File '{thema_index.THEMA_CODES_FILE}' not found."
+    except serialization.JSONDecodeError:
         return "Error reading JSON file. Please ensure it is properly formatted."
-    codes = thema_json.get("CodeList", {}).get("ThemaCodes", {}).get("Code", [])
-    
-    for code_entry in codes:
-        if code_entry.get("CodeValue") == code_value:
-            return code_entry.get("CodeDescription")
-    return None
 
 def load_main_genre(book_id: str) -> str:
-    path = STORAGE_PATH / f"book_{book_id}.json"
-    if not path.exists():
+    book_data = _find_book_details(book_id)
+    if book_data is None:
         raise HTTPException(status_code=404, detail="Book file not found")
 
-    with open(path, "r", encoding="utf-8") as f:
-        book_data = json.load(f)
-
     try:
         genres_str = book_data["overview"]["contentAnalysis"]["genres"]
         genres = [g.strip() for g in genres_str.split(",")]
@@ -155,10 +734,175 @@ def load_main_genre(book_id: str) -> str:
 
 def save_scores_as_json(audience_scores: dict, dir_path: Path, filename: str, ):
     """Save the audience scores dictionary as a JSON file."""
+    if _use_sqlite():
+        sqlite_store.save_scores(dir_path.name, filename, audience_scores)
+        print(f"[SPIDER CHART GENERATOR] Saved audience scores in {sqlite_store.SQLITE_PATH}: {dir_path.name}/{filename}")
+        return
     dir_path.mkdir(parents=True, exist_ok=True)
     output_path = dir_path / filename
 
-    with open(output_path, "w") as f:
-        json.dump(audience_scores, f, indent=4)
+    serialization.dump_file(output_path, audience_scores)
 
     print(f"[SPIDER CHART GENERATOR] Saved audience scores at: {output_path}")
+
+def scores_exist(dir_path: Path, filename: str) -> bool:
+    if _use_sqlite():
+        return sqlite_store.load_scores(dir_path.name, filename) is not None
+    return (dir_path / filename).is_file()
+
+def load_scores(dir_path: Path, filename: str):
+    if _use_sqlite():
+        scores = sqlite_store.load_scores(dir_path.name, filename)
+        if scores is None:
+            raise FileNotFoundError(f"No scores stored for {dir_path.name}/{filename}")
+        return scores
+    return serialization.load_file(dir_path / filename)
+
+# CHAT HISTORY METHODS
+# Messages are stored as LangChain message dicts (same format as FileChatMessageHistory).
+
+def load_chat_messages(book_id: str) -> list:
+    if _use_sqlite():
+        return sqlite_store.load_chat_messages(book_id)
+    path = CHAT_HISTORY_PATH / f"session_{book_id}.json"
+    if not path.exists():
+        return []
+    return serialization.load_file(path)
+
+def append_chat_message(book_id: str, message: dict):
+    if _use_sqlite():
+        sqlite_store.append_chat_message(book_id, message)
+        return
+    messages = load_chat_messages(book_id)
+    messages.append(message)
+    _write_json(CHAT_HISTORY_PATH / f"session_{book_id}.json", messages)
+
+def clear_chat_messages(book_id: str):
+    if _use_sqlite():
+        sqlite_store.clear_chat_messages(book_id)
+        return
+    path = CHAT_HISTORY_PATH / f"session_{book_id}.json"
+    if path.exists():
+        path.unlink()
+
+# INGESTION JOB METHODS
+# Uploads are kept as received and processed by background workers (see utils/preprocessing/ingestion.py).
+# Job records are small JSON documents, written by the worker process and polled by the API.
+
+def save_upload(book_id: str, filename: str, data: bytes) -> Path:
+    """Persist the raw uploaded manuscript, keeping its extension."""
+    path = UPLOADS_PATH / f"{book_id}{Path(filename).suffix.lower()}"
+    _write_bytes(path, data)
+    return path
+
+def save_job(job: dict):
+    if _use_sqlite():
+        sqlite_store.save_job(job)
+        return
+    _write_json(JOBS_PATH / f"{job['id']}.json", job)
+
+def load_job(job_id: str):
+    """Job record, or None for an unknown job."""
+    if _use_sqlite():
+        return sqlite_store.load_job(job_id)
+    path = JOBS_PATH / f"{job_id}.json"
+    if not path.exists():
+        return None
+    return serialization.load_file(path)
+
+# COMPRESSION CACHE METHODS
+# Compressed chapters keyed by a hash of the chapter text and the compression parameters
+# (see utils/preprocessing/preprocessing.py), so re-uploads and retried jobs skip LexRank.
+
+def load_compressed_chapter(key: str):
+    """Cached compressed chapter, or None."""
+    if _use_sqlite():
+        return sqlite_store.load_compressed_chapter(key)
+    path = COMPRESSION_CACHE_PATH / key[:2] / f"{key}.txt"
+    try:
+        return path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return None
+
+def save_compressed_chapter(key: str, text: str):
+    if _use_sqlite():
+        sqlite_store.save_compressed_chapter(key, text)
+        return
+    _write_bytes(COMPRESSION_CACHE_PATH / key[:2] / f"{key}.txt", text.encode("utf-8"))
+
+# CHUNK SUMMARY CACHE METHODS
+# LLM summaries of chunks keyed by a hash of the chunk text and the prompt (see utils/details/llm.py):
+# a revised manuscript only summarizes the chunks that changed.
+
+def load_chunk_summary(key: str):
+    """Cached chunk summary, or None."""
+    if _use_sqlite():
+        return sqlite_store.load_chunk_summary(key)
+    path = SUMMARY_CACHE_PATH / key[:2] / f"{key}.json"
+    try:
+        return serialization.load_file(path)
+    except FileNotFoundError:
+        return None
+
+def save_chunk_summary(key: str, summary: dict):
+    if _use_sqlite():
+        sqlite_store.save_chunk_summary(key, summary)
+        return
+    _write_json(SUMMARY_CACHE_PATH / key[:2] / f"{key}.json", summary)
+
+# CONTENT INDEX METHODS
+# Digests of uploaded manuscripts (raw bytes and normalized text) -> id of the book built from them,
+# so that a repeated upload reuses that book's chunks, details and dashboards (see ingestion.py).
+
+def save_content_digest(digest: str, book_id: str):
+    if _use_sqlite():
+        sqlite_store.save_content_digest(digest, book_id)
+        return
+    _write_bytes(CONTENT_INDEX_PATH / digest[:2] / digest, book_id.encode("utf-8"))
+
+def find_book_by_digest(digest: str):
+    """Id of a stored, ready book whose current revision was built from this content, or None."""
+    if _use_sqlite():
+        book_id = sqlite_store.load_content_digest(digest)
+    else:
+        try:
+            book_id = (CONTENT_INDEX_PATH / digest[:2] / digest).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            book_id = None
+    if book_id is None:
+        return None
+    try:
+        meta = _load_book_meta(book_id)
+    except ValueError: # deleted since
+        return None
+    # an index entry outlives the revision it was made for: the book must still hold that content
+    digests = meta.get("digests")
+    if digests is None: # stored before the digests were recorded: current unless revised since
+        digests = [digest] if meta.get("revision", 1) == 1 else []
+    if digest not in digests:
+        return None
+    return book_id if meta.get("status", "ready") == "ready" else None
+
+def copy_dashboards(source_id: str, book_id: str) -> int:
+    """Copy the dashboard charts computed for source_id to book_id. Returns the number of charts copied."""
+    source_suffix, target_suffix = f"_{source_id}.json", f"_{book_id}.json"
+    if _use_sqlite():
+        return sqlite_store.copy_scores(source_suffix, target_suffix)
+    copied = 0
+    for chart_dir in (p for p in DASHBOARDS_PATH.glob("*") if p.is_dir()):
+        for path in chart_dir.glob(f"*{source_suffix}"):
+            _write_bytes(chart_dir / (path.name[:-len(source_suffix)] + target_suffix), path.read_bytes())
+            copied += 1
+    return copied
+
+def delete_dashboards(book_id: str) -> int:
+    """Remove the dashboard charts of a book, so that they are generated again. Returns the number removed."""
+    suffix = f"_{book_id}.json"
+    if _use_sqlite():
+        return sqlite_store.delete_scores(suffix)
+    removed = 0
+    for chart_dir in (p for p in DASHBOARDS_PATH.glob("*") if p.is_dir()):
+        for path in chart_dir.glob(f"*{suffix}"):
+            _remove_file(path)
+            removed += 1
+    return removed
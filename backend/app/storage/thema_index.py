@@ -0,0 +1,102 @@
+# backend/app/storage/thema_index.py
+
+import bisect
+import pickle
+import threading
+
+from pathlib import Path
+from typing import List, Optional
+
+from backend.app.storage import serialization
+
+THEMA_CODES_FILE = Path("backend/app/storage/thema_codes/thema_codes.json")
+THEMA_INDEX_FILE = Path("backend/app/storage/thema_codes/thema_index.pickle")
+INDEX_FORMAT_VERSION = 1
+
+# Built once per process from thema_codes.json (2.8 MB) and persisted next to it as a pickle,
+# keyed by the source file's size and mtime so an updated code list is picked up automatically.
+#   codes    -> {code: (description, parent)}
+#   children -> {code: [child codes]}          ("" holds the top-level codes)
+#   sorted   -> all codes sorted, for prefix search
+_index = None
+_index_lock = threading.Lock()
+
+def _source_signature():
+    stat = THEMA_CODES_FILE.stat()
+    return (INDEX_FORMAT_VERSION, stat.st_size, stat.st_mtime_ns)
+
+def _build_index(signature) -> dict:
+    print(f"[THEMA_INDEX] Building index from {THEMA_CODES_FILE}...")
+    thema_json = serialization.load_file(THEMA_CODES_FILE)
+    entries = thema_json.get("CodeList", {}).get("ThemaCodes", {}).get("Code", [])
+
+    codes, children = {}, {}
+    for entry in entries:
+        code = entry.get("CodeValue")
+        if code is None:
+            continue
+        parent = entry.get("CodeParent") or ""
+        codes[code] = (entry.get("CodeDescription"), parent)
+        children.setdefault(parent, []).append(code)
+
+    return {"signature": signature, "codes": codes, "children": children, "sorted": sorted(codes)}
+
+def _load_persisted_index(signature):
+    try:
+        with open(THEMA_INDEX_FILE, "rb") as f:
+            index = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+    return index if index.get("signature") == signature else None
+
+def _persist_index(index: dict):
+    tmp_path = THEMA_INDEX_FILE.with_name(THEMA_INDEX_FILE.name + ".tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path.replace(THEMA_INDEX_FILE)
+    except OSError as e:
+        print(f"[THEMA_INDEX] Could not persist index: {e}")
+
+def get_thema_index() -> dict:
+    """Return the Thema index, loading or building it on first use. Raises FileNotFoundError / JSONDecodeError."""
+    global _index
+    if _index is not None:
+        return _index
+    with _index_lock:
+        if _index is None:
+            signature = _source_signature()
+            index = _load_persisted_index(signature)
+            if index is None:
+                index = _build_index(signature)
+                _persist_index(index)
+            _index = index
+    return _index
+
+def get_description(code: str) -> Optional[str]:
+    entry = get_thema_index()["codes"].get(code)
+    return entry[0] if entry else None
+
+def get_parent(code: str) -> Optional[str]:
+    entry = get_thema_index()["codes"].get(code)
+    return (entry[1] or None) if entry else None
+
+def get_ancestors(code: str) -> List[str]:
+    """Parents of a code, closest first."""
+    ancestors = []
+    parent = get_parent(code)
+    while parent and parent not in ancestors:
+        ancestors.append(parent)
+        parent = get_parent(parent)
+    return ancestors
+
+def get_children(code: str = "") -> List[str]:
+    """Direct children of a code; the top-level codes when code is empty."""
+    return list(get_thema_index()["children"].get(code, []))
+
+def find_by_prefix(prefix: str) -> List[str]:
+    """All codes starting with prefix, in sorted order."""
+    sorted_codes = get_thema_index()["sorted"]
+    start = bisect.bisect_left(sorted_codes, prefix)
+    end = bisect.bisect_left(sorted_codes, prefix + "￿")
+    return sorted_codes[start:end]
@@ -1,19 +1,18 @@
 # backend/app/utils/chat_history.py
 
-from pathlib import Path
 from typing import Dict, List
 
-from langchain.memory.chat_message_histories import FileChatMessageHistory
 from langchain.schema import AIMessage, HumanMessage
+from langchain_core.messages import message_to_dict, messages_from_dict
 
-CHAT_DIR = Path("backend/app/storage/chat_history")
-CHAT_DIR.mkdir(parents=True, exist_ok=True)
-
-def _get_history_obj(book_id: str) -> FileChatMessageHistory:
-    return FileChatMessageHistory(str(CHAT_DIR / f"session_{book_id}.json"))
+from backend.app.storage.storage import (
+    load_chat_messages,
+    append_chat_message,
+    clear_chat_messages
+)
 
 def get_history(book_id: str) -> List[Dict[str, str]]:
-    history = _get_history_obj(book_id).messages
+    history = messages_from_dict(load_chat_messages(book_id))
     result = []
     for msg in history:
         if isinstance(msg, HumanMessage):
@@ -23,12 +22,10 @@ def get_history(book_id: str) -> List[Dict[str, str]]:
     return result
 
 def add_user_message(book_id: str, content: str) -> None:
-    _get_history_obj(book_id).add_user_message(content)
+    append_chat_message(book_id, message_to_dict(HumanMessage(content=content)))
 
 def add_assistant_message(book_id: str, content: str) -> None:
-    _get_history_obj(book_id).add_ai_message(content)
+    append_chat_message(book_id, message_to_dict(AIMessage(content=content)))
 
 def clear_history(book_id: str) -> None:
-    path = CHAT_DIR / f"session_{book_id}.json"
-    if path.exists():
-        path.unlink()
+    clear_chat_messages(book_id)
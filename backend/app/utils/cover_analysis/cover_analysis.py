@@ -1,20 +1,8 @@
 # backend/app/utils/cover_analysis/cover_analysis.py
 
-import os
 import json
-from openai import AzureOpenAI
 
-# Azure OpenAI Configuration
-api_version = "2024-12-01-preview"
-AZURE_OPENAI_API_KEY = os.getenv("AZURE_OPENAI_INFERENCE_API_KEY")
-AZURE_OPENAI_ENDPOINT = os.getenv("AZURE_OPENAI_INFERENCE_ENDPOINT")
-AZURE_OPENAI_MODEL_NAME = os.getenv("AZURE_OPENAI_INFERENCE_MODEL_NAME")
-
-client = AzureOpenAI(
-    api_key=AZURE_OPENAI_API_KEY,
-    azure_endpoint=AZURE_OPENAI_ENDPOINT,
-    api_version=api_version,
-)
+from backend.app.utils.llm_client import chat
 
 def analyze_cover(base64_image: str, temperature: float = 0.3, max_tokens: int = 1000) -> dict:
     user_prompt = """
@@ -32,9 +20,8 @@ def analyze_cover(base64_image: str, temperature: float = 0.3, max_tokens: int =
     Do not include any emojis or markdown. Return raw valid JSON only.
     """
 
-    response = client.chat.completions.create(
-        model=AZURE_OPENAI_MODEL_NAME,
-        messages=[
+    raw_output = chat(
+        [
             {
                 "role": "user",
                 "content": [
@@ -47,8 +34,6 @@ def analyze_cover(base64_image: str, temperature: float = 0.3, max_tokens: int =
         max_tokens=max_tokens
     )
 
-    raw_output = response.choices[0].message.content
-
     try:
         return json.loads(raw_output)
     except Exception as e:
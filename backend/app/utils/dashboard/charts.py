@@ -0,0 +1,50 @@
+# backend/app/utils/dashboard/charts.py
+
+from backend.app.storage.storage import load_book_text, scores_exist
+from backend.app.utils.dashboard.target_reader import target_reader_chart_pipeline, TARGET_READER_CHART_DIR
+from backend.app.utils.dashboard.genres import genres_chart_pipeline, GENRES_CHART_DIR
+from backend.app.utils.dashboard.style_dna import style_dna_pipeline_chunks, STYLE_DNA_DIR
+from backend.app.utils.details.details import DETAILS_STAGES
+from backend.app.utils.stages import stage
+
+# The dashboard charts are stages plugged into the details graph (utils/details/details.py):
+# they take the overview from it, so the three charts are generated together, and from the same
+# overview as the book details page (generated first when the book has none yet).
+
+@stage("text_sample", "book_id")
+def _text_sample(book_id):
+    return load_book_text(book_id, max_chars=20000)
+
+@stage("main_genre", "overview")
+def _main_genre(overview):
+    genres = [g.strip() for g in overview["contentAnalysis"]["genres"].split(",")]
+    return genres[0] if genres else "Unknown"
+
+@stage("target_reader_chart", "book_id", "overview")
+def _target_reader_chart(book_id, overview):
+    return target_reader_chart_pipeline(book_id, overview.get("synopsis", ""))
+
+@stage("genres_chart", "book_id", "text_sample")
+def _genres_chart(book_id, text_sample):
+    return genres_chart_pipeline(book_id, text_sample)
+
+@stage("style_dna", "book_id", "main_genre")
+def _style_dna(book_id, main_genre):
+    return style_dna_pipeline_chunks(book_id, main_genre)
+
+CHART_STAGES = [_text_sample, _main_genre, _target_reader_chart, _genres_chart, _style_dna]
+DASHBOARD_STAGES = DETAILS_STAGES + CHART_STAGES
+
+# chart stage -> (directory, file name of a book's scores)
+CHARTS = {
+    "target_reader_chart": (TARGET_READER_CHART_DIR, "target_reader_chart_{}.json"),
+    "genres_chart": (GENRES_CHART_DIR, "genres_chart_{}.json"),
+    "style_dna": (STYLE_DNA_DIR, "style_dna_{}.json"),
+}
+
+def chart_file(chart: str, book_id: str):
+    directory, filename = CHARTS[chart]
+    return directory, filename.format(book_id)
+
+def missing_charts(book_id: str) -> list:
+    return [chart for chart in CHARTS if not scores_exist(*chart_file(chart, book_id))]
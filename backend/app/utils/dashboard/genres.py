@@ -21,8 +21,9 @@ def get_genres_scores(synopsis) -> dict:
             scores[seg.strip()] = float(pct.strip().rstrip("%"))
     return scores
 
-def genres_chart_pipeline(book_id: str):
-    text = load_book_text(book_id)[:20000]
+def genres_chart_pipeline(book_id: str, text: str = None):
+    if text is None:
+        text = load_book_text(book_id, max_chars=20000)
 
     genres_scores = get_genres_scores(text)
     print(f"[GENRES CHART GENERATOR] Genres repartition: {genres_scores}")
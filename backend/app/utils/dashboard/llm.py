@@ -1,19 +1,9 @@
 # backend/app/utils/dashboard/llm.py
 
-import os
+from backend.app.storage.llm_cache import langchain_cache
+from backend.app.utils.llm_client import chat_model
 
-from langchain_openai import AzureChatOpenAI
-
-# --- Azure OpenAI Configuration ---
-api_version = "2024-12-01-preview"
-AZURE_OPENAI_API_KEY = os.getenv("AZURE_OPENAI_INFERENCE_API_KEY")
-AZURE_OPENAI_ENDPOINT = os.getenv("AZURE_OPENAI_INFERENCE_ENDPOINT")
-AZURE_OPENAI_MODEL_NAME = os.getenv("AZURE_OPENAI_INFERENCE_MODEL_NAME")
-
-llm = AzureChatOpenAI(
-    api_key=AZURE_OPENAI_API_KEY,
-    azure_endpoint=AZURE_OPENAI_ENDPOINT,
-    api_version=api_version,
-    deployment_name=AZURE_OPENAI_MODEL_NAME,
-    temperature=0.1
+llm = chat_model(
+    temperature=0.1,
+    cache=langchain_cache(0.1) # identical prompts are answered from storage/llm_cache.py
 )
\ No newline at end of file
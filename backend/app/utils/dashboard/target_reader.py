@@ -21,9 +21,10 @@ def get_audience_scores(synopsis) -> dict:
             scores[seg.strip()] = float(pct.strip().rstrip("%"))
     return scores
 
-def target_reader_chart_pipeline(book_id: str):
-    book_data = load_book_details(book_id)
-    synopsis = book_data.get("overview", {}).get("synopsis", "")
+def target_reader_chart_pipeline(book_id: str, synopsis: str = None):
+    if synopsis is None:
+        book_data = load_book_details(book_id)
+        synopsis = book_data.get("overview", {}).get("synopsis", "")
 
     audience_scores = get_audience_scores(synopsis)
     print(f"[TARGET READER CHART GENERATOR] Audience scores: {audience_scores}")
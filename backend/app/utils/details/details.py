@@ -16,42 +16,104 @@ from backend.app.utils.details.llm import build_ecommerce_description, build_twe
 from backend.app.utils.details.parsers import parse_ecommerce
 # Global imports
 from backend.app.utils.details.parsers import parse_model_json_response
+from backend.app.utils.stages import stage, run_stages
 
 # Storage imports
-from backend.app.storage.storage import load_book_chunks, load_book_details, load_book_text, load_book_title, load_book_pages
+from backend.app.storage.storage import load_book_chunks, load_book_details, load_book_text, load_book_title, load_book_pages, DETAILS_SECTIONS
 
-def generate_analysis_components(book_id):
-    print(f"[GENERATE_ANALYSIS_COMPONENTS] Generating analysis for book {book_id}...")
-    chunks = load_book_chunks(book_id)
-    chapter_breakdown = build_chapter_breakdown(chunks)
-
-    analysis = {
-            "impact": parse_model_json_response(build_impact_analysis(chapter_breakdown)),
-            "characters": profile_generation_pipeline(chapter_breakdown),
-            "locations": location_note_pipeline(chapter_breakdown),
-            "chapters": chapter_breakdown 
-        }
-    
-    return analysis
-
-def generate_overview_components(book_id: str) -> dict:
-    print(f"[GENERATE_OVERVIEW_COMPONENTS] Generating overview for book {book_id}...")
-    book_data = load_book_details(book_id)
-    chapter_breakdown = book_data.get("analysis", {}).get("chapters", "")
-    title = load_book_title(book_id)
-    pages = load_book_pages(book_id)
-    synopsis = build_synopsis(chapter_breakdown, title)
-    text = load_book_text(book_id)
-    keywords = parse_keywords(build_keywords(synopsis, chapter_breakdown))
-    primary_thema, secondary_thema = thema_code_pipeline(synopsis)
-
-    overview = {
+# DETAILS GRAPH
+# Every artifact of the details is a stage naming its inputs (see utils/stages.py). The three
+# sections are stages too, so that independent LLM calls (time period, genres, tone, keywords,
+# thema codes, key data, ... all only need the synopsis and the chapter breakdown) run together.
+# Other graphs (the dashboard charts) extend DETAILS_STAGES with their own stages.
+
+@stage("chunks", "book_id")
+def _chunks(book_id):
+    return load_book_chunks(book_id)
+
+@stage("title", "book_id")
+def _title(book_id):
+    return load_book_title(book_id)
+
+@stage("pages", "book_id")
+def _pages(book_id):
+    return load_book_pages(book_id)
+
+@stage("text", "book_id")
+def _text(book_id):
+    return load_book_text(book_id)
+
+# Analysis
+
+@stage("chapter_breakdown", "chunks")
+def _chapter_breakdown(chunks):
+    return build_chapter_breakdown(chunks)
+
+@stage("impact", "chapter_breakdown")
+def _impact(chapter_breakdown):
+    return parse_model_json_response(build_impact_analysis(chapter_breakdown))
+
+@stage("characters", "chapter_breakdown")
+def _characters(chapter_breakdown):
+    return profile_generation_pipeline(chapter_breakdown)
+
+@stage("locations", "chapter_breakdown")
+def _locations(chapter_breakdown):
+    return location_note_pipeline(chapter_breakdown)
+
+@stage("analysis", "impact", "characters", "locations", "chapter_breakdown")
+def _analysis(impact, characters, locations, chapter_breakdown):
+    return {
+        "impact": impact,
+        "characters": characters,
+        "locations": locations,
+        "chapters": chapter_breakdown
+    }
+
+# Overview
+
+@stage("synopsis", "chapter_breakdown", "title")
+def _synopsis(chapter_breakdown, title):
+    return build_synopsis(chapter_breakdown, title)
+
+@stage("key_data", "text", "chapter_breakdown", "pages")
+def _key_data(text, chapter_breakdown, pages):
+    return build_key_data(text, chapter_breakdown, pages)
+
+@stage("time_period", "synopsis", "chapter_breakdown")
+def _time_period(synopsis, chapter_breakdown):
+    return build_time_period(synopsis, chapter_breakdown)
+
+@stage("genres", "synopsis", "chapter_breakdown")
+def _genres(synopsis, chapter_breakdown):
+    return build_genres(synopsis, chapter_breakdown)
+
+@stage("tone", "synopsis", "chapter_breakdown")
+def _tone(synopsis, chapter_breakdown):
+    return build_tone(synopsis, chapter_breakdown)
+
+@stage("keywords", "synopsis", "chapter_breakdown")
+def _keywords(synopsis, chapter_breakdown):
+    return parse_keywords(build_keywords(synopsis, chapter_breakdown))
+
+@stage("thema", "synopsis")
+def _thema(synopsis):
+    return thema_code_pipeline(synopsis) # (primary, secondary)
+
+@stage("comparison", "synopsis", "keywords")
+def _comparison(synopsis, keywords):
+    return parse_model_json_response(build_comparison(synopsis, keywords))
+
+@stage("overview", "synopsis", "key_data", "time_period", "genres", "tone", "keywords", "thema", "comparison")
+def _overview(synopsis, key_data, time_period, genres, tone, keywords, thema, comparison):
+    primary_thema, secondary_thema = thema
+    return {
         "synopsis": synopsis,
-        "keyData": build_key_data(text, chapter_breakdown, pages),
+        "keyData": key_data,
         "contentAnalysis": {
-            "timePeriod": build_time_period(synopsis, chapter_breakdown),
-            "genres": build_genres(synopsis, chapter_breakdown),
-            "tone": build_tone(synopsis, chapter_breakdown),
+            "timePeriod": time_period,
+            "genres": genres,
+            "tone": tone,
             "keywords": keywords,
         },
         "classification": {
@@ -62,35 +124,41 @@ def generate_overview_components(book_id: str) -> dict:
                 "4G (Research & development)"
             ]
         },
-        "comparison" : parse_model_json_response(build_comparison(synopsis, keywords))
+        "comparison" : comparison
     }
 
-    return overview
+# Marketing
+
+@stage("ecommerce", "synopsis", "title")
+def _ecommerce(synopsis, title):
+    return parse_ecommerce(build_ecommerce_description(synopsis, title))
+
+@stage("tweet_1", "synopsis")
+def _tweet_1(synopsis):
+    return build_tweet(synopsis)
+
+@stage("tweet_2", "synopsis")
+def _tweet_2(synopsis):
+    return build_tweet(synopsis)
 
-def generate_marketing_components(book_id):
-    print(f"[GENERATE_MARKETING_COMPONENTS] Generating marketing for book {book_id}...")
-    book_data = load_book_details(book_id)
-    synopsis = book_data.get("overview", {}).get("synopsis", "")
-    title = load_book_title(book_id)
+@stage("tiktok", "synopsis")
+def _tiktok(synopsis):
+    return parse_model_json_response(build_tiktok_script(synopsis))
 
-    marketing = {
-        "ecommerce": parse_ecommerce(build_ecommerce_description(synopsis, title)),
+@stage("marketing", "ecommerce", "tweet_1", "tweet_2", "tiktok")
+def _marketing(ecommerce, tweet_1, tweet_2, tiktok):
+    return {
+        "ecommerce": ecommerce,
         "social": {
             "twitter": [
                 {
-                    "content" : build_tweet(synopsis),
-                    "metrics" : {
-                        "likes": rd.randint(0, 100),
-                        "retweets": rd.randint(0, 100)
-                    }
-                },
-                {
-                    "content" : build_tweet(synopsis),
+                    "content" : tweet,
                     "metrics" : {
                         "likes": rd.randint(0, 100),
                         "retweets": rd.randint(0, 100)
                     }
                 }
+                for tweet in (tweet_1, tweet_2)
             ],
             "instagram": [
                 {
@@ -102,13 +170,54 @@ def generate_marketing_components(book_id):
                     }
                 }
             ],
-            "tiktok": [parse_model_json_response(build_tiktok_script(synopsis))],
+            "tiktok": [tiktok],
         },
         "visuals": []
     }
-    print(f"[GENERATE_MARKETING_COMPONENTS] Marketing components generated successfully.")
 
-    return marketing
+DETAILS_STAGES = [
+    _chunks, _title, _pages, _text,
+    _chapter_breakdown, _impact, _characters, _locations, _analysis,
+    _synopsis, _key_data, _time_period, _genres, _tone, _keywords, _thema, _comparison, _overview,
+    _ecommerce, _tweet_1, _tweet_2, _tiktok, _marketing,
+]
+
+def details_artifacts(book_id: str, book_data: dict = None) -> dict:
+    """Artifacts already known from the stored details: generated sections and the inputs taken from them."""
+    book_data = book_data or {}
+    artifacts = {"book_id": book_id}
+    for section in DETAILS_SECTIONS:
+        if section in book_data:
+            artifacts[section] = book_data[section]
+    if "analysis" in book_data:
+        artifacts["chapter_breakdown"] = book_data["analysis"].get("chapters", "")
+    if "overview" in book_data:
+        artifacts["synopsis"] = book_data["overview"].get("synopsis", "")
+    return artifacts
 
+def generate_details(book_id: str, sections, book_data: dict = None, on_section=None, stages=None) -> dict:
+    """
+    Generate the given sections (and only the stages they need) from the stored details.
+    on_section(name, value) is called as each section completes. Returns {section: value}.
+    """
+    print(f"[GENERATE_DETAILS] Generating {', '.join(sections)} for book {book_id}...")
+    artifacts, _ = run_stages(
+        stages or DETAILS_STAGES,
+        sections,
+        details_artifacts(book_id, book_data),
+        on_result=lambda name, value: on_section(name, value) if on_section and name in sections else None
+    )
+    return {section: artifacts[section] for section in sections}
+
+def generate_analysis_components(book_id):
+    return generate_details(book_id, ["analysis"])["analysis"]
 
+def generate_overview_components(book_id: str, book_data: dict = None) -> dict:
+    if book_data is None:
+        book_data = load_book_details(book_id)
+    return generate_details(book_id, ["overview"], book_data)["overview"]
 
+def generate_marketing_components(book_id, book_data: dict = None):
+    if book_data is None:
+        book_data = load_book_details(book_id)
+    return generate_details(book_id, ["marketing"], book_data)["marketing"]
@@ -1,14 +1,14 @@
 # backend/app/utils/extraction.py
 
-import torch
-
-from sentence_transformers import SentenceTransformer, util
 from typing import List
 
-embedding_model = SentenceTransformer("all-MiniLM-L6-v2")
-
+from backend.app.utils.models import get_model
 
 def extract_relevant_chunks(chunks: List[str], location_name: str, max_chunks: int = 5) -> List[str]:
+    import torch # imported on first use, like the model: it costs seconds at startup
+    from sentence_transformers import util
+
+    embedding_model = get_model("sentence_embeddings")
     chunk_embeddings = embedding_model.encode(chunks, convert_to_tensor=True)
     query_embedding = embedding_model.encode(location_name, convert_to_tensor=True)
     cosine_scores = util.cos_sim(query_embedding, chunk_embeddings)[0]
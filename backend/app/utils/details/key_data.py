@@ -1,9 +1,7 @@
 # backend/app/utils/details/key_data.py
 
-import spacy
-
-nlp = spacy.load("en_core_web_sm")
-nlp.max_length = 10_000_000
+from backend.app.utils.models import get_model
+from backend.app.utils.details.llm import breakdown_chapters
 
 def build_key_data(text: str, chapter_breakdown, pages) -> dict:
     # Key data 
@@ -12,10 +10,10 @@ def build_key_data(text: str, chapter_breakdown, pages) -> dict:
     hours = int(reading_minutes / 60)
     minutes = int(reading_minutes % 60)
     estimated_reading_time = f"{hours}h {minutes}m" if hours > 0 else f"{minutes} minutes"
-    chapter_count = len(chapter_breakdown)
+    chapter_count = len(breakdown_chapters(chapter_breakdown)) # a summary may cover several chapters, or part of one
 
     # NLP analysis
-    doc = nlp(text)
+    doc = get_model("spacy_en")(text)
     people = list({ent.text for ent in doc.ents if ent.label_ == "PERSON"})
     locations = list({ent.text for ent in doc.ents if ent.label_ in ["GPE", "LOC"]})    
 
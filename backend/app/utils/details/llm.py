@@ -1,12 +1,19 @@
 # backend/app/generation/llm.py
 
+import hashlib
+import os
+import time
+
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
+from backend.app.storage.storage import load_chunk_summary, save_chunk_summary
 from backend.app.utils.details.llm_core import call_llm
 from backend.app.utils.details.parsers import parse_model_json_response
 
 ### CHAPTER SUMMARIZATION ###
 
-def summarize_chunk(chunk_text: str, chunk_id: int) -> dict:
+def summarize_chunk(chunk_text: str) -> dict:
     prompt = f"""
             You are a helpful assistant tasked with summarizing a passage from a book.
 
@@ -35,13 +42,105 @@ def summarize_chunk(chunk_text: str, chunk_id: int) -> dict:
         }
 
     return {
-        "chapter_name": f"Chapter {chunk_id + 1}",
         "raw_output": parsed.get("raw_output", "").strip(),
         "suggested_title": parsed.get("suggested_title", "").strip()
     }
 
-def build_chapter_breakdown(chunks) -> dict:
-    return [summarize_chunk(chunk, i) for i, chunk in enumerate(chunks)]
+# Summaries are cached by chunk text: unchanged chunks of a new revision (or of a re-upload)
+# are not sent to the LLM again. Change SUMMARY_PROMPT when summarize_chunk's prompt changes.
+SUMMARY_PROMPT = "summarize-1"
+
+def chunk_summary_key(chunk_text: str) -> str:
+    return hashlib.sha256(f"{SUMMARY_PROMPT}|".encode("utf-8") + chunk_text.encode("utf-8")).hexdigest()
+
+def cache_chunk_summary(chunk_text: str, summary: dict):
+    """Store a chunk summary ({"raw_output", "suggested_title"}, the chapter name depends on the chunk's place in the book)."""
+    save_chunk_summary(chunk_summary_key(chunk_text), {
+        "raw_output": summary.get("raw_output", ""),
+        "suggested_title": summary.get("suggested_title", "")
+    })
+
+# Chunks are summarized concurrently (each call mostly waits on the model), at most
+# SUMMARY_CONCURRENCY at a time; the breakdown keeps the chunk order. Throttled or failed
+# round trips are retried by the shared client (utils/llm_client.py).
+SUMMARY_CONCURRENCY = int(os.getenv("PLEIADE_SUMMARY_CONCURRENCY", "8"))
+
+def chapter_labels(chapter_lists: List[list]) -> List[str]:
+    """
+    Name of each chunk of a book from the chapters it covers (0-based indexes, see pack_chunks):
+    "Chapter 3", "Chapters 3–5" for small chapters packed together, "Chapter 7 (part 2)" for a split one.
+    """
+    chunk_counts = Counter(chapters[0] for chapters in chapter_lists if len(chapters) == 1)
+    parts = Counter()
+    labels = []
+    for chapters in chapter_lists:
+        if len(chapters) > 1:
+            labels.append(f"Chapters {chapters[0] + 1}–{chapters[-1] + 1}")
+        elif chunk_counts[chapters[0]] > 1:
+            parts[chapters[0]] += 1
+            labels.append(f"Chapter {chapters[0] + 1} (part {parts[chapters[0]]})")
+        else:
+            labels.append(f"Chapter {chapters[0] + 1}")
+    return labels
+
+def _chunk_summary(chunk_text: str):
+    """(summary, reused): the cached summary of the chunk, or a new one."""
+    cached = load_chunk_summary(chunk_summary_key(chunk_text))
+    if cached is not None:
+        return cached, True
+    summary = summarize_chunk(chunk_text)
+    cache_chunk_summary(chunk_text, summary)
+    return summary, False
+
+def build_chapter_breakdown(chunks, concurrency: int = None, progress=None) -> list:
+    """
+    Summaries of the chunks ({"chunk_text", "chapters"}, see pack_chunks), in order, each named
+    after the chapters it covers ("chapters" holds their 1-based numbers). chunks may be a stream
+    (see preprocessing_stream): each chunk is submitted as soon as it arrives.
+    progress("summarize", done, total) is called as summaries complete, once the stream has ended.
+    """
+    report = progress or (lambda stage, done, total: None)
+    concurrency = max(1, concurrency or SUMMARY_CONCURRENCY)
+    started = time.perf_counter()
+    chapter_lists = []
+
+    def texts():
+        for i, chunk in enumerate(chunks):
+            chapter_lists.append(chunk.get("chapters") or [i]) # chunks stored before chapters were recorded
+            yield chunk["chunk_text"]
+
+    if concurrency == 1:
+        results = [_chunk_summary(text) for text in texts()]
+        report("summarize", len(results), len(results))
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="summarize") as executor:
+            futures = [executor.submit(_chunk_summary, text) for text in texts()]
+            results = []
+            try:
+                for future in futures:
+                    results.append(future.result())
+                    report("summarize", len(results), len(futures))
+            except Exception:
+                for future in futures: # do not wait for the queued chunks
+                    future.cancel()
+                raise
+
+    breakdown = [
+        {
+            "chapter_name": label,
+            "chapters": [index + 1 for index in chapters],
+            "raw_output": summary.get("raw_output", ""),
+            "suggested_title": summary.get("suggested_title", "")
+        }
+        for (summary, _), label, chapters in zip(results, chapter_labels(chapter_lists), chapter_lists)
+    ]
+    reused = sum(1 for _, was_cached in results if was_cached)
+    print(f"[BUILD_CHAPTER_BREAKDOWN] {len(breakdown)} chunks ({reused} summaries reused) in {time.perf_counter() - started:.1f}s, concurrency {concurrency}.")
+    return breakdown
+
+def breakdown_chapters(chapter_breakdown) -> set:
+    """Chapter numbers covered by a breakdown (a breakdown made before chapters were recorded has one per summary)."""
+    return {n for i, c in enumerate(chapter_breakdown) for n in c.get("chapters", [i + 1])}
 
 def build_impact_analysis(chapter_breakdown) -> str:
     context = "\n".join([c["raw_output"] for c in chapter_breakdown])
@@ -1,28 +1,16 @@
 # backend/app/utils/details/llm_core.py
 
-import os
-from openai import AzureOpenAI
+from backend.app.storage.llm_cache import cached_call
+from backend.app.utils.llm_client import chat, AZURE_OPENAI_MODEL_NAME
 
-# Azure OpenAI Configuration
-api_version = "2024-12-01-preview"
-AZURE_OPENAI_API_KEY = os.getenv("AZURE_OPENAI_INFERENCE_API_KEY")
-AZURE_OPENAI_ENDPOINT = os.getenv("AZURE_OPENAI_INFERENCE_ENDPOINT")
-AZURE_OPENAI_MODEL_NAME = os.getenv("AZURE_OPENAI_INFERENCE_MODEL_NAME")
-
-client = AzureOpenAI(
-    api_key=AZURE_OPENAI_API_KEY,
-    azure_endpoint=AZURE_OPENAI_ENDPOINT,
-    api_version=api_version,
-)
-
-def call_llm(system: str, user: str, temperature: float = 0.1, max_tokens: int = 4096) -> str:
-    response = client.chat.completions.create(
-        model=AZURE_OPENAI_MODEL_NAME,
-        messages=[
-            {"role": "system", "content": system},
-            {"role": "user", "content": user}
-        ],
-        temperature=temperature,
-        max_tokens=max_tokens
-    )
-    return response.choices[0].message.content
+def call_llm(system: str, user: str, temperature: float = 0.1, max_tokens: int = 4096, cache: bool = None) -> str:
+    """
+    Chat completion, answered from the response cache (storage/llm_cache.py) when the same call
+    was made before. cache=False always calls the model, cache=True caches even a high temperature call.
+    """
+    messages = [
+        {"role": "system", "content": system},
+        {"role": "user", "content": user}
+    ]
+    key = ("call_llm", AZURE_OPENAI_MODEL_NAME, system, user, temperature, max_tokens)
+    return cached_call(key, temperature, lambda: chat(messages, temperature, max_tokens), cache)
@@ -0,0 +1,267 @@
+# backend/app/utils/llm_client.py
+
+import asyncio
+import os
+import random
+import re
+import threading
+import time
+import weakref
+
+import httpx
+
+from openai import AzureOpenAI, AsyncAzureOpenAI
+from langchain_openai import AzureChatOpenAI
+
+# One Azure OpenAI client layer for the whole app (details, dashboard, chatbot, cover analysis).
+# Every request goes through the same keep-alive connection pool, with explicit timeouts. The
+# transport below retries throttled (429) and failed (5xx, timeouts, dropped connections) requests
+# with exponential backoff and jitter, or after the server's Retry-After, and lets at most
+# PLEIADE_LLM_DEPLOYMENT_CONCURRENCY requests per deployment in flight: the summaries, the details
+# stages and the chatbot share the deployment's rate limit instead of each hammering it.
+# The limit is per process: each uvicorn worker has its own, and the ingestion workers split one
+# between them (share_deployment_concurrency), so the deployment sees at most
+# PLEIADE_LLM_DEPLOYMENT_CONCURRENCY x (uvicorn workers + 1) requests in flight.
+
+# Azure OpenAI Configuration
+API_VERSION = "2024-12-01-preview"
+AZURE_OPENAI_API_KEY = os.getenv("AZURE_OPENAI_INFERENCE_API_KEY")
+AZURE_OPENAI_ENDPOINT = os.getenv("AZURE_OPENAI_INFERENCE_ENDPOINT")
+AZURE_OPENAI_MODEL_NAME = os.getenv("AZURE_OPENAI_INFERENCE_MODEL_NAME")
+
+LLM_CONNECT_TIMEOUT = float(os.getenv("PLEIADE_LLM_CONNECT_TIMEOUT", "10"))
+LLM_READ_TIMEOUT = float(os.getenv("PLEIADE_LLM_READ_TIMEOUT", "120")) # between two bytes of the answer
+LLM_MAX_CONNECTIONS = int(os.getenv("PLEIADE_LLM_MAX_CONNECTIONS", "32"))
+LLM_KEEPALIVE_EXPIRY = float(os.getenv("PLEIADE_LLM_KEEPALIVE_EXPIRY", "90")) # seconds an idle connection is kept
+LLM_MAX_RETRIES = int(os.getenv("PLEIADE_LLM_MAX_RETRIES", "5"))
+LLM_DEPLOYMENT_CONCURRENCY = int(os.getenv("PLEIADE_LLM_DEPLOYMENT_CONCURRENCY", "8"))
+LLM_RETRY_BASE_DELAY = 1.0 # seconds, doubled at each attempt
+LLM_RETRY_MAX_DELAY = 60.0
+
+TIMEOUT = httpx.Timeout(LLM_READ_TIMEOUT, connect=LLM_CONNECT_TIMEOUT)
+LIMITS = httpx.Limits(
+    max_connections=LLM_MAX_CONNECTIONS,
+    max_keepalive_connections=LLM_MAX_CONNECTIONS,
+    keepalive_expiry=LLM_KEEPALIVE_EXPIRY,
+)
+RETRY_STATUS = {408, 429, 500, 502, 503, 504}
+RETRY_ERRORS = (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+
+_DEPLOYMENT = re.compile(r"/deployments/([^/]+)/")
+
+# RETRIES AND CONCURRENCY LIMITS
+
+def retry_delay(attempt: int, headers=None) -> float:
+    """Seconds to wait before retry attempt + 1: the server's Retry-After, or backoff with jitter."""
+    if headers is not None:
+        for header, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+            try:
+                return min(float(headers[header]) * scale, LLM_RETRY_MAX_DELAY)
+            except (KeyError, TypeError, ValueError):
+                pass
+    return min(LLM_RETRY_BASE_DELAY * 2 ** attempt, LLM_RETRY_MAX_DELAY) * random.uniform(0.5, 1.5)
+
+def _deployment(request: httpx.Request) -> str:
+    match = _DEPLOYMENT.search(request.url.path)
+    return match.group(1) if match else request.url.host
+
+_lock = threading.Lock()
+_semaphores = {} # deployment -> threading.BoundedSemaphore
+_async_semaphores = weakref.WeakKeyDictionary() # event loop -> {deployment: asyncio.Semaphore}, dropped with the loop
+
+def share_deployment_concurrency(processes: int):
+    """Give this process its share of the limit, when `processes` processes call the deployments
+    at the same time (ingestion workers). Call it before the first request."""
+    global LLM_DEPLOYMENT_CONCURRENCY
+    LLM_DEPLOYMENT_CONCURRENCY = max(1, LLM_DEPLOYMENT_CONCURRENCY // max(1, processes))
+
+def _semaphore(deployment: str) -> threading.BoundedSemaphore:
+    with _lock:
+        if deployment not in _semaphores:
+            _semaphores[deployment] = threading.BoundedSemaphore(LLM_DEPLOYMENT_CONCURRENCY)
+        return _semaphores[deployment]
+
+def _async_semaphore(deployment: str) -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop() # an asyncio.Semaphore belongs to one loop
+    with _lock:
+        semaphores = _async_semaphores.setdefault(loop, {})
+        if deployment not in semaphores:
+            semaphores[deployment] = asyncio.Semaphore(LLM_DEPLOYMENT_CONCURRENCY)
+        return semaphores[deployment]
+
+def _log_retry(request: httpx.Request, reason: str, attempt: int, delay: float):
+    print(f"[LLM_CLIENT] {_deployment(request)}: {reason}, retry {attempt + 1}/{LLM_MAX_RETRIES} in {delay:.1f}s.")
+
+class _ReleasingStream(httpx.SyncByteStream):
+    """Response body that frees the deployment slot once read (or closed), streamed answers included."""
+
+    def __init__(self, stream, release):
+        self._stream, self._release = stream, release
+
+    def __iter__(self):
+        for part in self._stream:
+            yield part
+
+    def close(self):
+        try:
+            self._stream.close()
+        finally:
+            if self._release:
+                self._release()
+                self._release = None
+
+class _AsyncReleasingStream(httpx.AsyncByteStream):
+
+    def __init__(self, stream, release):
+        self._stream, self._release = stream, release
+
+    async def __aiter__(self):
+        async for part in self._stream:
+            yield part
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._release:
+                self._release()
+                self._release = None
+
+class RetryTransport(httpx.BaseTransport):
+    """Pooled transport with per-deployment concurrency limit and retries on 429/5xx."""
+
+    def __init__(self):
+        self._transport = httpx.HTTPTransport(limits=LIMITS)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        semaphore = _semaphore(_deployment(request))
+        semaphore.acquire()
+        try:
+            for attempt in range(LLM_MAX_RETRIES + 1):
+                try:
+                    response = self._transport.handle_request(request)
+                except RETRY_ERRORS as e:
+                    if attempt == LLM_MAX_RETRIES:
+                        raise
+                    delay = retry_delay(attempt)
+                    _log_retry(request, type(e).__name__, attempt, delay)
+                    time.sleep(delay)
+                    continue
+
+                if response.status_code in RETRY_STATUS and attempt < LLM_MAX_RETRIES:
+                    delay = retry_delay(attempt, response.headers)
+                    response.close()
+                    _log_retry(request, f"HTTP {response.status_code}", attempt, delay)
+                    time.sleep(delay)
+                    continue
+
+                return httpx.Response(
+                    status_code=response.status_code,
+                    headers=response.headers,
+                    stream=_ReleasingStream(response.stream, semaphore.release),
+                    extensions=response.extensions,
+                )
+        except BaseException:
+            semaphore.release()
+            raise
+
+    def close(self):
+        self._transport.close()
+
+class AsyncRetryTransport(httpx.AsyncBaseTransport):
+
+    def __init__(self):
+        self._transport = httpx.AsyncHTTPTransport(limits=LIMITS)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        semaphore = _async_semaphore(_deployment(request))
+        await semaphore.acquire()
+        try:
+            for attempt in range(LLM_MAX_RETRIES + 1):
+                try:
+                    response = await self._transport.handle_async_request(request)
+                except RETRY_ERRORS as e:
+                    if attempt == LLM_MAX_RETRIES:
+                        raise
+                    delay = retry_delay(attempt)
+                    _log_retry(request, type(e).__name__, attempt, delay)
+                    await asyncio.sleep(delay)
+                    continue
+
+                if response.status_code in RETRY_STATUS and attempt < LLM_MAX_RETRIES:
+                    delay = retry_delay(attempt, response.headers)
+                    await response.aclose()
+                    _log_retry(request, f"HTTP {response.status_code}", attempt, delay)
+                    await asyncio.sleep(delay)
+                    continue
+
+                return httpx.Response(
+                    status_code=response.status_code,
+                    headers=response.headers,
+                    stream=_AsyncReleasingStream(response.stream, semaphore.release),
+                    extensions=response.extensions,
+                )
+        except BaseException:
+            semaphore.release()
+            raise
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+# SHARED CLIENTS
+# Retries are done by the transport: the SDK and LangChain ones are turned off (max_retries=0).
+
+http_client = httpx.Client(transport=RetryTransport(), timeout=TIMEOUT)
+async_http_client = httpx.AsyncClient(transport=AsyncRetryTransport(), timeout=TIMEOUT)
+
+client = AzureOpenAI(
+    api_key=AZURE_OPENAI_API_KEY,
+    azure_endpoint=AZURE_OPENAI_ENDPOINT,
+    api_version=API_VERSION,
+    http_client=http_client,
+    timeout=TIMEOUT,
+    max_retries=0,
+)
+
+async_client = AsyncAzureOpenAI(
+    api_key=AZURE_OPENAI_API_KEY,
+    azure_endpoint=AZURE_OPENAI_ENDPOINT,
+    api_version=API_VERSION,
+    http_client=async_http_client,
+    timeout=TIMEOUT,
+    max_retries=0,
+)
+
+def chat(messages: list, temperature: float = 0.1, max_tokens: int = 4096, model: str = None) -> str:
+    """Content of a chat completion."""
+    response = client.chat.completions.create(
+        model=model or AZURE_OPENAI_MODEL_NAME,
+        messages=messages,
+        temperature=temperature,
+        max_tokens=max_tokens
+    )
+    return response.choices[0].message.content
+
+async def achat(messages: list, temperature: float = 0.1, max_tokens: int = 4096, model: str = None) -> str:
+    response = await async_client.chat.completions.create(
+        model=model or AZURE_OPENAI_MODEL_NAME,
+        messages=messages,
+        temperature=temperature,
+        max_tokens=max_tokens
+    )
+    return response.choices[0].message.content
+
+def chat_model(temperature: float = 0.1, **kwargs) -> AzureChatOpenAI:
+    """LangChain chat model on the shared clients (invoke uses the sync pool, ainvoke/astream the async one)."""
+    return AzureChatOpenAI(
+        api_key=AZURE_OPENAI_API_KEY,
+        azure_endpoint=AZURE_OPENAI_ENDPOINT,
+        api_version=API_VERSION,
+        deployment_name=AZURE_OPENAI_MODEL_NAME,
+        temperature=temperature,
+        http_client=http_client,
+        http_async_client=async_http_client,
+        timeout=TIMEOUT,
+        max_retries=0,
+        **kwargs
+    )
@@ -0,0 +1,152 @@
+# backend/app/utils/models.py
+
+import os
+import resource
+import threading
+import time
+
+from typing import Callable, Dict, List
+
+from langchain_core.embeddings import Embeddings
+
+# Local models are loaded on first use, once per process, and shared by every module that needs
+# them (retrievers, rerankers, details). Importing the app loads nothing: a worker starts in a
+# fraction of the time and only pays for the models its requests actually use.
+# PLEIADE_PRELOAD_MODELS (comma separated names, or "all") loads models in the background at
+# startup instead; /health/ready reports not ready until they are loaded.
+PRELOAD_MODELS = [name.strip() for name in os.getenv("PLEIADE_PRELOAD_MODELS", "").split(",") if name.strip()]
+
+# nltk data used by the preprocessing (sumy-style sentence splitting and word tokenization).
+# nltk 3.9 serves the Punkt tokenizer from punkt_tab (also for "tokenizers/punkt/english.pickle").
+# Downloaded by setup.sh, only checked here: nothing is downloaded while serving.
+#   python -c "import nltk; nltk.download('punkt_tab')"
+NLTK_RESOURCES = ("tokenizers/punkt_tab",)
+
+EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+RERANKER_MODEL_NAME = "BAAI/bge-reranker-base"
+SPACY_MODEL_NAME = "en_core_web_sm"
+
+# LOADERS
+
+def _load_sentence_embeddings():
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(EMBEDDING_MODEL_NAME)
+
+def _load_bge_reranker():
+    from sentence_transformers import CrossEncoder
+    return CrossEncoder(RERANKER_MODEL_NAME)
+
+def _load_spacy_en():
+    import spacy
+    nlp = spacy.load(SPACY_MODEL_NAME)
+    nlp.max_length = 10_000_000
+    return nlp
+
+LOADERS: Dict[str, Callable] = {
+    "sentence_embeddings": _load_sentence_embeddings,
+    "bge_reranker": _load_bge_reranker,
+    "spacy_en": _load_spacy_en,
+}
+
+# REGISTRY
+
+_models = {} # name -> loaded model
+_stats = {} # name -> {"seconds", "rss_mb"}
+_locks = {name: threading.Lock() for name in LOADERS}
+_preload = {"started": False, "done": False, "error": None}
+_startup = {}
+
+def _rss_mb() -> float:
+    """Resident memory of this process."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 # peak, in KB on Linux
+
+def get_model(name: str):
+    """Shared instance of a registered model, loaded on first call (concurrent callers wait for the same load)."""
+    model = _models.get(name)
+    if model is not None:
+        return model
+    if name not in LOADERS:
+        raise KeyError(f"Unknown model '{name}', expected one of: {', '.join(LOADERS)}")
+
+    with _locks[name]:
+        if name not in _models:
+            rss, started = _rss_mb(), time.perf_counter()
+            _models[name] = LOADERS[name]()
+            _stats[name] = {
+                "seconds": round(time.perf_counter() - started, 3),
+                "rss_mb": round(_rss_mb() - rss, 1),
+            }
+            print(f"[MODELS] Loaded {name} in {_stats[name]['seconds']}s (+{_stats[name]['rss_mb']} MB resident).")
+    return _models[name]
+
+class SharedEmbeddings(Embeddings):
+    """LangChain embeddings on the shared MiniLM instance (same vectors as HuggingFaceEmbeddings)."""
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        texts = [text.replace("\n", " ") for text in texts]
+        return get_model("sentence_embeddings").encode(texts).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+embeddings = SharedEmbeddings()
+
+# STARTUP AND READINESS
+
+def missing_nltk_resources() -> List[str]:
+    import nltk
+    missing = []
+    for resource_name in NLTK_RESOURCES:
+        try:
+            nltk.data.find(resource_name)
+        except LookupError:
+            missing.append(resource_name)
+    return missing
+
+def preload_models(names: List[str] = None):
+    """Load the given models (default PRELOAD_MODELS, "all" for every model) in a background thread."""
+    names = PRELOAD_MODELS if names is None else names
+    names = list(LOADERS) if names == ["all"] else names
+    if not names:
+        _preload["done"] = True
+        return
+    if _preload["started"]:
+        return
+    _preload["started"] = True
+
+    def run():
+        try:
+            for name in names:
+                get_model(name)
+        except Exception as e:
+            _preload["error"] = f"{type(e).__name__}: {e}"
+            print(f"[MODELS] Preloading failed: {_preload['error']}")
+        finally:
+            _preload["done"] = True
+
+    threading.Thread(target=run, name="model-preload", daemon=True).start()
+
+def record_startup(seconds: float):
+    """Called once the app is ready to serve, with the time spent importing and starting it."""
+    _startup.update(seconds=round(seconds, 3), rss_mb=round(_rss_mb(), 1))
+    print(f"[MODELS] Started in {_startup['seconds']}s, {_startup['rss_mb']} MB resident.")
+
+def model_report() -> dict:
+    """Readiness of this worker: local resources, loaded models with their load time and memory."""
+    missing = missing_nltk_resources()
+    preload_done = _preload["done"] or not PRELOAD_MODELS
+    return {
+        "ready": not missing and preload_done and _preload["error"] is None,
+        "missing_resources": missing,
+        "startup": _startup,
+        "preload": {"models": PRELOAD_MODELS, "done": preload_done, "error": _preload["error"]},
+        "models": {
+            name: dict(loaded=name in _models, **_stats.get(name, {}))
+            for name in LOADERS
+        },
+        "rss_mb": round(_rss_mb(), 1),
+    }
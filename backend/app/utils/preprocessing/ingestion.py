@@ -0,0 +1,307 @@
+# backend/app/utils/preprocessing/ingestion.py
+
+import datetime
+import hashlib
+import multiprocessing
+import os
+import secrets
+import threading
+import time
+import traceback
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from backend.app.storage.storage import (
+    save_book, save_book_details, save_job, load_job, load_book_text, load_book_chunks, load_book_pages,
+    load_book_details, load_book_meta, load_book_chunk_texts, save_content_digest, find_book_by_digest,
+    copy_dashboards, delete_dashboards
+)
+from backend.app.utils import llm_client
+from backend.app.utils.details.llm import cache_chunk_summary, build_chapter_breakdown
+from backend.app.utils.preprocessing import pdf_extraction, preprocessing
+from backend.app.utils.preprocessing.pdf_extraction import extract_pdf_text
+from backend.app.utils.preprocessing.preprocessing import preprocessing_stream, remove_gutenberg_boilerplate, basic_clean, chunk_hash
+
+# Uploads are processed outside the API process: /upload stores the raw file and a job record,
+# and a pool of worker processes runs extraction and preprocessing (LexRank is CPU bound and
+# would otherwise block the event loop). Workers report progress on the job record.
+INGESTION_WORKERS = int(os.getenv("PLEIADE_INGESTION_WORKERS", "2"))
+# Each worker runs its own PDF extraction and compression pools. Unless PLEIADE_PDF_WORKERS or
+# PLEIADE_COMPRESSION_WORKERS set them (per ingestion worker), they share the cores: at most
+# INGESTION_WORKERS x INNER_WORKERS (about os.cpu_count()) busy processes, not cpu_count squared.
+INNER_WORKERS = max(1, (os.cpu_count() or 1) // INGESTION_WORKERS)
+# Chunks are summarized while the next chapters are compressed (see summarize_while_preprocessing)
+SUMMARIZE_ON_INGEST = os.getenv("PLEIADE_SUMMARIZE_ON_INGEST", "on").lower() not in ("0", "off", "false")
+
+# Share of the overall progress given to each stage
+STAGES = {
+    "extract": 0.20,
+    "clean": 0.05,
+    "segment": 0.05,
+    "compress": 0.45,
+    "summarize": 0.20,
+    "save": 0.05,
+}
+PROGRESS_WRITE_INTERVAL = 0.5 # seconds between two job writes within a stage
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                # spawn: workers must not inherit the server's threads and open connections
+                _executor = ProcessPoolExecutor(
+                    max_workers=INGESTION_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker
+                )
+    return _executor
+
+def _init_worker():
+    """Runs once in each ingestion worker process: sizes its inner pools and its share of the LLM slots."""
+    llm_client.share_deployment_concurrency(INGESTION_WORKERS)
+    if "PLEIADE_PDF_WORKERS" not in os.environ:
+        pdf_extraction.PDF_WORKERS = INNER_WORKERS
+    if "PLEIADE_COMPRESSION_WORKERS" not in os.environ:
+        preprocessing.COMPRESSION_WORKERS = INNER_WORKERS
+
+def _now() -> str:
+    return datetime.datetime.now().isoformat()
+
+def create_ingestion_job(book_id: str, upload_path: Path, filename: str, title: str, author: str, cover: str,
+                         revision_of: str = None) -> dict:
+    """revision_of: id of the book this upload is a new draft of (book_id is then that same id)."""
+    job = {
+        "id": secrets.token_hex(8),
+        "book_id": book_id,
+        "filename": filename,
+        "upload_path": str(upload_path),
+        "title": title,
+        "author": author,
+        "cover": cover,
+        "status": "queued",
+        "stage": None,
+        "stage_done": 0,
+        "stage_total": 0,
+        "progress": 0.0,
+        "error": None,
+        "duplicate_of": None,
+        "revision_of": revision_of,
+        "changed_chunks": None,
+        "created": _now(),
+        "updated": _now(),
+    }
+    save_job(job)
+    return job
+
+def submit_ingestion_job(job: dict):
+    """Queue the job on the worker pool. A pool that cannot take it marks the job as failed."""
+    try:
+        future = _get_executor().submit(run_ingestion_job, job["id"])
+    except Exception as e:
+        print(f"[INGESTION] Could not submit job {job['id']}: {e}")
+        save_job(dict(job, status="failed", error=str(e), updated=_now()))
+        return
+
+    def log_crash(f):
+        if f.exception() is not None: # run_ingestion_job records its own errors, this is a dead worker
+            print(f"[INGESTION] Worker crashed on job {job['id']}: {f.exception()}")
+            save_job(dict(load_job(job["id"]) or job, status="failed", error=str(f.exception()), updated=_now()))
+
+    future.add_done_callback(log_crash)
+
+def _progress_reporter(job: dict):
+    """Return progress(stage, done, total), writing the job when the stage changes or at most every PROGRESS_WRITE_INTERVAL."""
+    names = list(STAGES)
+    last_write = [0.0]
+
+    def progress(stage: str, done: int, total: int):
+        fraction = done / total if total else 1.0
+        overall = sum(STAGES[name] for name in names[:names.index(stage)]) + STAGES[stage] * fraction
+        stage_changed = job["stage"] != stage
+        job.update(stage=stage, stage_done=done, stage_total=total, progress=round(min(overall, 1.0), 4))
+        if stage_changed or done >= total or time.monotonic() - last_write[0] >= PROGRESS_WRITE_INTERVAL:
+            job["updated"] = _now()
+            save_job(job)
+            last_write[0] = time.monotonic()
+
+    return progress
+
+def extract_text(path: Path, progress=None, metrics: dict = None):
+    """
+    Return (text, pages) of an uploaded manuscript. progress(stage, done, total) follows the pages
+    of a PDF, and metrics receives the time spent per extraction engine.
+    """
+    report = progress or (lambda stage, done, total: None)
+    path = Path(path)
+    if path.suffix.lower() == ".pdf":
+        print("[INGESTION] Detected PDF file. Extracting text...")
+        return extract_pdf_text(path, progress=report, metrics=metrics)
+
+    report("extract", 0, 1)
+    text = path.read_bytes().decode("utf-8", errors="replace")
+    report("extract", 1, 1)
+    return text, text.count("\n") // 30 # rough estimate for .txt
+
+# DEDUPLICATION
+# A manuscript is identified by the digest of the uploaded bytes and by the digest of its normalized
+# text (the same book exported again, or as .txt instead of .pdf). A repeated upload becomes a new
+# book with its own title, author and cover, whose chunks, details and dashboard charts are copied
+# from the existing one: no preprocessing and no LLM call.
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def text_digest(text: str) -> str:
+    normalized = " ".join(basic_clean(remove_gutenberg_boilerplate(text)).split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+def _book_record(job: dict, pages: int, text: str, chunks: list, revision: int = 1, digests=()) -> dict:
+    return {
+        "id": job["book_id"],
+        "title": job["title"],
+        "cover": job["cover"],
+        "author": job["author"],
+        "uploadDate": job["created"],
+        "pages": pages,
+        "status": "ready",
+        "revision": revision,
+        "digests": list(digests), # content digests indexed to this revision (see find_book_by_digest)
+        "chunks": chunks,
+        "text": text
+    }
+
+def link_duplicate(job: dict, source_id: str, pages: int = None, digests=()):
+    """Store the job's book with the content, details and dashboards of source_id."""
+    save_book(_book_record(
+        job,
+        load_book_pages(source_id) if pages is None else pages,
+        load_book_text(source_id),
+        load_book_chunks(source_id),
+        digests=digests
+    ))
+    try:
+        details = load_book_details(source_id)
+    except Exception: # details never generated
+        details = {}
+    save_book_details(job["book_id"], details)
+    charts = copy_dashboards(source_id, job["book_id"])
+    print(f"[INGESTION] Book {job['book_id']} is a copy of {source_id}: reused its chunks, details and {charts} chart(s).")
+
+# REVISIONS
+# A new draft of a book keeps its id. The chunk summaries of the previous revision are put in the
+# summary cache before the new draft is summarized, so that only new or edited chunks are sent to
+# the model again. The details and dashboards (aggregates over every chunk) are kept when no chunk
+# changed, and reset otherwise.
+
+def carry_over_summaries(book_id: str) -> list:
+    """Put the chunk summaries of the book's current revision in the summary cache. Returns its chunk texts."""
+    previous = load_book_chunk_texts(book_id)
+    try:
+        breakdown = load_book_details(book_id).get("analysis", {}).get("chapters", [])
+    except Exception: # details never generated
+        breakdown = []
+    if len(breakdown) == len(previous): # summaries are aligned with the chunks they were made from
+        for text, summary in zip(previous, breakdown):
+            cache_chunk_summary(text, summary)
+    return previous
+
+def prepare_revision(job: dict, chunks: list, previous: list) -> bool:
+    """Record the chunks changed since the previous revision (chunk texts) on the job. True when nothing changed."""
+    previous_hashes = [chunk_hash(text) for text in previous]
+    known = set(previous_hashes)
+    job["changed_chunks"] = [i for i, chunk in enumerate(chunks) if chunk["hash"] not in known]
+    unchanged = [chunk["hash"] for chunk in chunks] == previous_hashes
+    print(f"[INGESTION] Revision of {job['book_id']}: {len(job['changed_chunks'])} of {len(chunks)} chunks changed.")
+    return unchanged
+
+# SUMMARIES
+# The chunk summaries (the slowest part of the details) are made during ingestion, as the chunks
+# come out of preprocessing_stream: the model works on the first chunks while the next chapters
+# are compressed. They land in the summary cache, where the details generation finds them.
+
+def summarize_while_preprocessing(stream, progress=None) -> list:
+    """Chunks of the stream, summarized as they arrive. Failed summaries are left to the details generation."""
+    chunks = []
+    preprocessing_error = []
+
+    def collect():
+        try:
+            for chunk in stream:
+                chunks.append(chunk)
+                yield chunk
+        except Exception as e:
+            preprocessing_error.append(e)
+            raise
+
+    pending = collect()
+    try:
+        build_chapter_breakdown(pending, progress=progress)
+    except Exception as e:
+        if preprocessing_error:
+            raise
+        print(f"[INGESTION] Summaries failed ({type(e).__name__}: {e}), left to the details generation.")
+        for _ in pending: # finish preprocessing
+            pass
+    return chunks
+
+def run_ingestion_job(job_id: str):
+    """Worker entry point: extract, preprocess and store the book of an ingestion job."""
+    job = load_job(job_id)
+    if job is None:
+        print(f"[INGESTION] Unknown job {job_id}")
+        return
+    job.update(status="running", updated=_now())
+    save_job(job)
+    progress = _progress_reporter(job)
+    print(f"[INGESTION] Job {job_id}: processing '{job['filename']}' as book {job['book_id']}")
+
+    try:
+        revision_of = job.get("revision_of")
+        upload_digest = file_digest(job["upload_path"])
+        source_id = None if revision_of else find_book_by_digest(upload_digest)
+        pages = None
+        if source_id is None:
+            job["extraction_metrics"] = {}
+            text, pages = extract_text(job["upload_path"], progress, job["extraction_metrics"])
+            content_digest = text_digest(text)
+            source_id = None if revision_of else find_book_by_digest(content_digest)
+
+        if source_id is not None:
+            progress("save", 0, 1)
+            link_duplicate(job, source_id, pages, digests=(upload_digest,))
+            job["duplicate_of"] = source_id
+        else:
+            previous = carry_over_summaries(revision_of) if revision_of else None
+            stream = preprocessing_stream(text, progress)
+            chunks = summarize_while_preprocessing(stream, progress) if SUMMARIZE_ON_INGEST else list(stream)
+            progress("save", 0, 1)
+            unchanged = prepare_revision(job, chunks, previous) if revision_of else False
+            revision = load_book_meta(revision_of).get("revision", 1) + 1 if revision_of else 1
+            chunks = [{"chunk_id": i, **chunk} for i, chunk in enumerate(chunks)]
+            # the digests of the previous draft are not carried over: re-uploading it is not a duplicate of this revision
+            save_book(_book_record(job, pages, text, chunks, revision, digests=(upload_digest, content_digest)))
+            if not unchanged:
+                save_book_details(job["book_id"], {})
+                if revision_of:
+                    delete_dashboards(job["book_id"])
+            save_content_digest(content_digest, job["book_id"])
+        save_content_digest(upload_digest, job["book_id"])
+        progress("save", 1, 1)
+    except Exception as e:
+        traceback.print_exc()
+        job.update(status="failed", error=str(e), updated=_now())
+        save_job(job)
+        return
+
+    job.update(status="done", progress=1.0, updated=_now())
+    save_job(job)
+    print(f"[INGESTION] Job {job_id} complete.")
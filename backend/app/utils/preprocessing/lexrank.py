@@ -0,0 +1,124 @@
+# backend/app/utils/preprocessing/lexrank.py
+
+import os
+import re
+import numpy as np
+import nltk
+
+from collections import Counter
+from functools import lru_cache
+from scipy import sparse
+from typing import List
+
+# Extractive LexRank with the semantics of sumy's PlaintextParser + LexRankSummarizer (english,
+# no stemmer, no stop words), computed on sparse matrices instead of Python loops:
+#   tf = count / max count in the sentence, idf = log(N / (1 + df))
+#   similarity = idf-modified cosine, binarized at THRESHOLD and normalized by row degree
+#   scores = power method until the update norm drops to EPSILON
+# The best sentence_count sentences are returned in document order.
+THRESHOLD = 0.1
+EPSILON = 0.1
+
+# Very long chapters can be ranked on an evenly spaced sample of their sentences: the similarity
+# graph is quadratic in the number of sentences. 0 ranks every sentence (same output as sumy).
+MAX_SENTENCES = int(os.getenv("PLEIADE_LEXRANK_MAX_SENTENCES", "0"))
+
+_WORD_PATTERN = re.compile(r"^[^\W\d_](?:[^\W\d_]|['-])*$", re.UNICODE)
+_EXTRA_ABBREVIATIONS = ["e.g", "al", "i.e"] # added by sumy to the english Punkt model
+
+@lru_cache(maxsize=None)
+def _sentence_tokenizer():
+    tokenizer = nltk.data.load("tokenizers/punkt/english.pickle")
+    tokenizer._params.abbrev_types.update(_EXTRA_ABBREVIATIONS)
+    return tokenizer
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Sentences of a plain text, as sumy's PlaintextParser sees them: paragraphs are separated by
+    blank lines, lines written in capitals are headings (never ranked).
+    """
+    tokenizer = _sentence_tokenizer()
+    sentences, lines = [], []
+
+    def flush():
+        block = " ".join(lines).strip()
+        if block:
+            sentences.extend(s.strip() for s in tokenizer.tokenize(block))
+        lines.clear()
+
+    for line in text.strip().splitlines():
+        line = line.strip()
+        if line.isupper() or not line:
+            flush()
+        else:
+            lines.append(line)
+    flush()
+    return sentences
+
+def sentence_words(sentence: str) -> List[str]:
+    return [word.lower() for word in nltk.word_tokenize(sentence) if _WORD_PATTERN.match(word)]
+
+def _tf_idf_matrix(sentences_words: List[List[str]]) -> sparse.csr_matrix:
+    """Sentences x terms matrix of tf * idf weights."""
+    vocabulary = {}
+    rows, cols, values = [], [], []
+    for row, words in enumerate(sentences_words):
+        counts = Counter(words)
+        max_tf = max(counts.values()) if counts else 1
+        for term, count in counts.items():
+            rows.append(row)
+            cols.append(vocabulary.setdefault(term, len(vocabulary)))
+            values.append(count / max_tf)
+
+    tf = sparse.csr_matrix((values, (rows, cols)), shape=(len(sentences_words), len(vocabulary)))
+    df = np.bincount(cols, minlength=len(vocabulary))
+    idf = np.log(len(sentences_words) / (1.0 + df))
+    return tf @ sparse.diags(idf)
+
+def _similarity_graph(weights: sparse.csr_matrix, threshold: float) -> sparse.csr_matrix:
+    """Row-normalized adjacency of the sentences whose cosine similarity exceeds threshold."""
+    norms = np.sqrt(np.asarray(weights.multiply(weights).sum(axis=1)).ravel())
+    inverse = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+    normalized = sparse.diags(inverse) @ weights
+    similarity = (normalized @ normalized.T).tocsr()
+
+    similarity.data = (similarity.data > threshold).astype(float)
+    similarity.eliminate_zeros()
+    degrees = np.asarray(similarity.sum(axis=1)).ravel()
+    degrees[degrees == 0] = 1
+    return sparse.diags(1.0 / degrees) @ similarity
+
+def power_method(matrix: sparse.csr_matrix, epsilon: float) -> np.ndarray:
+    transposed = matrix.T.tocsr()
+    p_vector = np.full(matrix.shape[0], 1.0 / matrix.shape[0])
+    lambda_val = 1.0
+    while lambda_val > epsilon:
+        next_p = transposed @ p_vector
+        lambda_val = np.linalg.norm(next_p - p_vector)
+        p_vector = next_p
+    return p_vector
+
+def rank_sentences(sentences: List[str], max_sentences: int = None) -> np.ndarray:
+    """LexRank score of each sentence (-inf for sentences left out of the sample)."""
+    max_sentences = MAX_SENTENCES if max_sentences is None else max_sentences
+    ranked = np.arange(len(sentences))
+    if max_sentences and len(sentences) > max_sentences:
+        ranked = np.unique(np.linspace(0, len(sentences) - 1, max_sentences).round().astype(int))
+
+    weights = _tf_idf_matrix([sentence_words(sentences[i]) for i in ranked])
+    scores = np.full(len(sentences), -np.inf)
+    scores[ranked] = power_method(_similarity_graph(weights, THRESHOLD), EPSILON)
+    return scores
+
+def summarize(text: str, sentence_count: int, max_sentences: int = None) -> List[str]:
+    """The sentence_count best ranked sentences of text, in document order."""
+    sentences = split_sentences(text)
+    if not sentences:
+        return []
+    scores = rank_sentences(sentences, max_sentences)
+
+    # sumy rates sentences through a dict keyed by their text: repeated sentences share the score of the last one
+    last_score = dict(zip(sentences, scores))
+    ratings = np.array([last_score[sentence] for sentence in sentences])
+    best = np.argsort(-ratings, kind="stable")[:sentence_count]
+    return [sentences[i] for i in sorted(best)]
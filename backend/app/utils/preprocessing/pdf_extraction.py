@@ -0,0 +1,202 @@
+# backend/app/utils/preprocessing/pdf_extraction.py
+
+import multiprocessing
+import os
+import signal
+import threading
+import time
+import pdfplumber
+import pypdfium2 as pdfium
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from pathlib import Path
+
+# Pages are extracted by a pool of processes, in batches of consecutive pages (each task opens
+# the PDF once), then reassembled in page order. Small documents are extracted in-process since
+# starting the pool would cost more than it saves. Inside ingestion workers, the default pool size
+# is a share of the cores (see ingestion.INNER_WORKERS).
+PDF_WORKERS = int(os.getenv("PLEIADE_PDF_WORKERS", str(os.cpu_count() or 1)))
+PDF_PAGE_TIMEOUT = float(os.getenv("PLEIADE_PDF_PAGE_TIMEOUT", "30")) # seconds, 0 disables it
+PDF_PAGES_PER_TASK = 16
+
+# Text is read with a fast engine first; pages where it finds fewer than PDF_FALLBACK_MIN_CHARS
+# characters (unusual encodings, text drawn as vector paths, ...) are read again with the fallback
+# engine. An empty fallback disables the second pass.
+PDF_ENGINE = os.getenv("PLEIADE_PDF_ENGINE", "pdfium")
+PDF_FALLBACK_ENGINE = os.getenv("PLEIADE_PDF_FALLBACK_ENGINE", "pdfplumber")
+PDF_FALLBACK_MIN_CHARS = int(os.getenv("PLEIADE_PDF_FALLBACK_MIN_CHARS", "32"))
+
+# ENGINES
+# An engine opens a document and returns the text of a page by number.
+
+class PdfiumEngine:
+    """pdfium's text layer, without layout analysis. Several times faster than pdfplumber."""
+    name = "pdfium"
+
+    def __init__(self, path: str):
+        self.pdf = pdfium.PdfDocument(path)
+
+    def page_count(self) -> int:
+        return len(self.pdf)
+
+    def page_text(self, number: int) -> str:
+        page = self.pdf[number]
+        textpage = page.get_textpage()
+        try:
+            return textpage.get_text_bounded().replace("\r\n", "\n").replace("\r", "\n")
+        finally:
+            textpage.close()
+            page.close()
+
+    def close(self):
+        self.pdf.close()
+
+class PdfplumberEngine:
+    """pdfplumber's layout-aware extraction (pdfminer), slower but more tolerant."""
+    name = "pdfplumber"
+
+    def __init__(self, path: str):
+        self.pdf = pdfplumber.open(path)
+
+    def page_count(self) -> int:
+        return len(self.pdf.pages)
+
+    def page_text(self, number: int) -> str:
+        page = self.pdf.pages[number]
+        try:
+            return page.extract_text() or ""
+        finally:
+            page.flush_cache() # pdfplumber keeps parsed objects of every visited page
+
+    def close(self):
+        self.pdf.close()
+
+ENGINES = {engine.name: engine for engine in (PdfiumEngine, PdfplumberEngine)}
+
+@contextmanager
+def open_engine(name: str, path: str):
+    if name not in ENGINES:
+        raise ValueError(f"Unknown PDF engine '{name}', expected one of: {', '.join(ENGINES)}")
+    engine = ENGINES[name](path)
+    try:
+        yield engine
+    finally:
+        engine.close()
+
+# EXTRACTION
+
+class PageTimeout(Exception):
+    pass
+
+@contextmanager
+def _page_timeout(seconds: float):
+    """
+    Abort the extraction of a page after `seconds` (SIGALRM, so only armed on the main thread).
+    Yields a dict whose "expired" flag tells a timeout apart from other errors, since pdfplumber
+    wraps the exceptions raised while it parses. The alarm is handled between Python bytecodes:
+    a page stuck inside a single pdfium call is only interrupted when that call returns.
+    """
+    state = {"expired": False}
+    if not seconds or threading.current_thread() is not threading.main_thread():
+        yield state
+        return
+
+    def on_alarm(signum, frame):
+        state["expired"] = True
+        raise PageTimeout()
+
+    previous = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield state
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+def _read_page(engine, number: int, page_timeout: float, metrics: dict) -> str:
+    """Text of one page with one engine, "" when it fails or times out. Adds the time spent to metrics."""
+    started = time.perf_counter()
+    try:
+        with _page_timeout(page_timeout) as state:
+            return engine.page_text(number)
+    except Exception as e:
+        if state["expired"]:
+            print(f"[PDF_EXTRACTION] {engine.name}: page {number + 1} timed out after {page_timeout}s, skipped.")
+        else:
+            print(f"[PDF_EXTRACTION] {engine.name}: page {number + 1} failed: {e}")
+        return ""
+    finally:
+        engine_metrics = metrics.setdefault(engine.name, {"pages": 0, "seconds": 0.0})
+        engine_metrics["pages"] += 1
+        engine_metrics["seconds"] += time.perf_counter() - started
+
+def _extract_pages(path: str, start: int, end: int, page_timeout: float, engine_name: str, fallback_name: str):
+    """Returns (texts of pages [start, end), per-engine metrics)."""
+    metrics = {}
+    with open_engine(engine_name, path) as engine:
+        texts = [_read_page(engine, number, page_timeout, metrics) for number in range(start, end)]
+
+    retry = [i for i, text in enumerate(texts) if len(text.strip()) < PDF_FALLBACK_MIN_CHARS]
+    if fallback_name and fallback_name != engine_name and retry:
+        with open_engine(fallback_name, path) as fallback:
+            for i in retry:
+                text = _read_page(fallback, start + i, page_timeout, metrics)
+                if len(text.strip()) > len(texts[i].strip()):
+                    texts[i] = text
+    return texts, metrics
+
+def _merge_metrics(total: dict, metrics: dict):
+    for name, engine_metrics in metrics.items():
+        merged = total.setdefault(name, {"pages": 0, "seconds": 0.0})
+        merged["pages"] += engine_metrics["pages"]
+        merged["seconds"] += engine_metrics["seconds"]
+
+def count_pages(path, engine_name: str = None) -> int:
+    with open_engine(engine_name or PDF_ENGINE, str(path)) as engine:
+        return engine.page_count()
+
+def extract_pdf_text(path, workers: int = None, page_timeout: float = None, progress=None,
+                     engine: str = None, fallback_engine: str = None, metrics: dict = None):
+    """
+    Return (text, pages) of a PDF, pages joined by newlines.
+    progress(stage, done, total) is called with stage "extract" as pages complete.
+    When a metrics dict is given, it is filled with {engine: {"pages", "seconds"}} (seconds summed over workers).
+    """
+    report = progress or (lambda stage, done, total: None)
+    workers = max(1, workers or PDF_WORKERS)
+    page_timeout = PDF_PAGE_TIMEOUT if page_timeout is None else page_timeout
+    engine = engine or PDF_ENGINE
+    fallback_engine = PDF_FALLBACK_ENGINE if fallback_engine is None else fallback_engine
+    metrics = {} if metrics is None else metrics
+    path = str(Path(path))
+    pages = count_pages(path, engine)
+    started = time.perf_counter()
+    report("extract", 0, pages)
+
+    batches = [(start, min(start + PDF_PAGES_PER_TASK, pages)) for start in range(0, pages, PDF_PAGES_PER_TASK)]
+    results = {}
+    if workers == 1 or len(batches) <= 1:
+        for start, end in batches:
+            results[start], batch_metrics = _extract_pages(path, start, end, page_timeout, engine, fallback_engine)
+            _merge_metrics(metrics, batch_metrics)
+            report("extract", end, pages)
+    else:
+        done = 0
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=min(workers, len(batches)), mp_context=context) as executor:
+            futures = {
+                executor.submit(_extract_pages, path, start, end, page_timeout, engine, fallback_engine): start
+                for start, end in batches
+            }
+            for future in as_completed(futures):
+                texts, batch_metrics = future.result()
+                results[futures[future]] = texts
+                _merge_metrics(metrics, batch_metrics)
+                done += len(texts)
+                report("extract", done, pages)
+
+    texts = [text for start, _ in batches for text in results[start]]
+    timings = ", ".join(f"{name} {m['pages']} pages {m['seconds']:.1f}s" for name, m in metrics.items())
+    print(f"[PDF_EXTRACTION] Extracted {pages} pages with {min(workers, len(batches)) or 1} worker(s) in {time.perf_counter() - started:.1f}s ({timings}).")
+    return "\n".join(texts), pages
@@ -1,13 +1,16 @@
 # backend/app/generation/preprocessing.py
 
+import hashlib
+import multiprocessing
+import os
 import re 
 import tiktoken
 import unidecode
 
-from typing import List
-from sumy.parsers.plaintext import PlaintextParser
-from sumy.nlp.tokenizers import Tokenizer
-from sumy.summarizers.lex_rank import LexRankSummarizer
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Iterable, Iterator, List, Optional
+from backend.app.storage.storage import load_compressed_chapter, save_compressed_chapter
+from backend.app.utils.preprocessing import lexrank
 
 enc = tiktoken.get_encoding("cl100k_base")
 
@@ -54,76 +57,319 @@ def basic_clean(text: str) -> str:
 def get_token_count(text: str) -> int:
     return len(enc.encode(text))
 
-def remove_toc_using_chapter_density(text: str, max_gap_tokens: int = 100) -> str:
-    chapter_pattern = re.compile(r'(chapter\s+\d+|chapter\s+[ivxlc]+)', re.IGNORECASE)
-    matches = list(chapter_pattern.finditer(text))
+_SENTENCE_END = re.compile(r"[.!?]+[\"')\]]*\s+|\n\s*\n")
 
-    print(f"[REMOVE_TOC_USING_CHAPTER_DENSITY] Found {len(matches)} candidates.")
+def split_sentence_spans(text: str) -> List[str]:
+    """Consecutive pieces of text, each ending at a sentence end or paragraph break (joined, they give text back)."""
+    pieces, start = [], 0
+    for match in _SENTENCE_END.finditer(text):
+        pieces.append(text[start:match.end()])
+        start = match.end()
+    if start < len(text):
+        pieces.append(text[start:])
+    return pieces
 
-    for i in range(len(matches) - 1):
-        current = matches[i]
-        next_one = matches[i + 1]
-        in_between = text[current.end():next_one.start()]
-        gap_tokens = get_token_count(in_between)
+# CHAPTER SEGMENTATION
+# Headings are found in a single scan of the text. The table of contents is detected from the
+# density of headings: TOC entries follow each other within a few tokens, the first heading
+# followed by more than max_gap_tokens starts the book. Gap sizes are estimated from character
+# offsets (cl100k averages about 4 characters per token on prose), so no gap is tokenized.
+CHARS_PER_TOKEN = 4
 
-        # still in the toc
-        if gap_tokens <= max_gap_tokens:
-            continue
-        else:
-            # first real chapter
-            print(f"[REMOVE_TOC_USING_CHAPTER_DENSITY] First real chapter at position {current.start()}, gap to next: {gap_tokens} tokens")
-            return text[current.start():]
+_NUMBER_WORDS = (
+    r"(?:(?:twenty|thirty|forty|fifty|sixty|seventy|eighty|ninety)(?:[-\s](?:one|two|three|four|five|six|seven|eight|nine))?"
+    r"|eleven|twelve|thirteen|fourteen|fifteen|sixteen|seventeen|eighteen|nineteen"
+    r"|one|two|three|four|five|six|seven|eight|nine|ten)"
+)
+_HEADING_PATTERN = re.compile(
+    # "Chapter 3", "CHAPTER XII", "Chapter One", "Chapter Twenty-One" (anywhere, as before)
+    rf"(?P<chapter>chapter\s+(?:\d+|[ivxlc]+|{_NUMBER_WORDS})\b)"
+    # "Part II", "PART ONE" on their own line
+    rf"|(?P<part>^[ \t]*part\s+(?:\d+|[ivxlc]+|{_NUMBER_WORDS})\b[^\n]{{0,80}}$)"
+    # "1. The Beginning" on its own line
+    r"|(?P<numbered>^[ \t]*(?P<number>\d{1,3})\.[ \t]+\S[^\n]{0,80}$)",
+    re.IGNORECASE | re.MULTILINE
+)
+HEADING_STYLES = ("chapter", "part", "numbered") # by priority, the first style with 2 headings is used
 
-    print("[REMOVE_TOC_USING_CHAPTER_DENSITY] Could not determine TOC end — returning original text.")
-    return text
+def estimate_tokens(chars: int) -> int:
+    return chars // CHARS_PER_TOKEN
 
-def split_into_chapters(text: str, fallback_chunk_size: int = 1000) -> List[str]:
-    text = remove_toc_using_chapter_density(text) # TOC removal
+def find_headings(text: str) -> dict:
+    """{style: [(start, end, number or None), ...]} for every heading candidate, in one pass over the text."""
+    headings = {style: [] for style in HEADING_STYLES}
+    for match in _HEADING_PATTERN.finditer(text):
+        style = match.lastgroup if match.lastgroup != "number" else "numbered"
+        number = int(match.group("number")) if style == "numbered" else None
+        headings[style].append((match.start(), match.end(), number))
+    return headings
+
+def _first_real_heading(headings: list, max_gap_tokens: int):
+    """Index of the first heading followed by more than max_gap_tokens, None when the TOC end cannot be found."""
+    for i in range(len(headings) - 1):
+        gap_tokens = estimate_tokens(headings[i + 1][0] - headings[i][1])
+        if gap_tokens > max_gap_tokens:
+            return i
+    return None
 
-    chapter_pattern = re.compile(r'(chapter\s+(?:\d+|[ivxlc]+))\b', re.IGNORECASE) # regex for chapter headings
-    chapter_matches = list(chapter_pattern.finditer(text))
+def _numbered_sequence(headings: list, max_gap_tokens: int) -> list:
+    """
+    Keep numbered headings forming the sequence 1, 2, 3... Headings closely followed by another
+    one (numbered lists inside a chapter) are dropped, and when a number repeats, the last
+    occurrence before the next number wins.
+    """
+    spaced = [
+        heading for i, heading in enumerate(headings)
+        if i + 1 == len(headings) or estimate_tokens(headings[i + 1][0] - heading[1]) > max_gap_tokens
+    ]
+    sequence = []
+    for heading in spaced:
+        if heading[2] == len(sequence) + 1:
+            sequence.append(heading)
+        elif sequence and heading[2] == len(sequence):
+            sequence[-1] = heading
+    return sequence
 
-    if len(chapter_matches) >= 2:
-        print(f"[SPLIT_INTO_CHAPTERS] {len(chapter_matches)} chapter headings detected.")
+def _select_headings(text: str, max_gap_tokens: int):
+    """
+    Returns (style, headings, toc_found) for the first style with 2 headings, or (None, [], False).
+    Headings start at the first real chapter when the end of the TOC was found.
+    """
+    candidates = find_headings(text)
+    for style in HEADING_STYLES:
+        headings = candidates[style]
+        if len(headings) < 2:
+            continue
+        first = _first_real_heading(headings, max_gap_tokens)
+        if first is not None:
+            headings = headings[first:]
+        if style == "numbered":
+            headings = _numbered_sequence(headings, max_gap_tokens)
+        if len(headings) >= 2:
+            return style, headings, first is not None
+    return None, [], False
+
+def segment_chapters(text: str, max_gap_tokens: int = 100, fallback_chunk_size: int = 1000) -> List[str]:
+    """Drop the table of contents and split the text on its chapter headings (or in chunks of fallback_chunk_size words)."""
+    style, headings, _ = _select_headings(text, max_gap_tokens)
+
+    if headings:
+        print(f"[SEGMENT_CHAPTERS] {len(headings)} '{style}' headings, first real chapter at position {headings[0][0]}.")
         chunks = []
-        for i in range(len(chapter_matches)):
-            start = chapter_matches[i].start()
-            end = chapter_matches[i + 1].start() if i + 1 < len(chapter_matches) else len(text)
+        for i, (start, _, _) in enumerate(headings):
+            end = headings[i + 1][0] if i + 1 < len(headings) else len(text)
             chunks.append(text[start:end].strip())
         return chunks
 
-    print("[SPLIT_INTO_CHAPTERS] No structure found — fallback to chunking.") 
-    words = text.split()
-    chunks = []
-    for i in range(0, len(words), fallback_chunk_size):
-        chunk = ' '.join(words[i:i+fallback_chunk_size])
-        chunks.append(chunk)
+    print("[SEGMENT_CHAPTERS] No structure found — fallback to chunking.")
+    chunks, current, words = [], [], 0
+    for sentence in split_sentence_spans(text): # about fallback_chunk_size words, cut between sentences
+        current.append(sentence)
+        words += len(sentence.split())
+        if words >= fallback_chunk_size:
+            chunks.append("".join(current).strip())
+            current, words = [], 0
+    if "".join(current).strip():
+        chunks.append("".join(current).strip())
     return chunks
 
-def compress_text_sumy(text: str, sentence_count: int = 5) -> str:
-    parser = PlaintextParser.from_string(text, Tokenizer("english"))
-    summarizer = LexRankSummarizer()
-    summary = summarizer(parser.document, sentence_count)
-    return " ".join(str(sentence) for sentence in summary)
+def remove_toc_using_chapter_density(text: str, max_gap_tokens: int = 100) -> str:
+    """Text from the first real chapter on, unchanged when the TOC end cannot be determined."""
+    style, headings, toc_found = _select_headings(text, max_gap_tokens)
+    if not toc_found:
+        print("[REMOVE_TOC_USING_CHAPTER_DENSITY] Could not determine TOC end — returning original text.")
+        return text
+    return text[headings[0][0]:]
+
+def split_into_chapters(text: str, fallback_chunk_size: int = 1000) -> List[str]:
+    return segment_chapters(text, fallback_chunk_size=fallback_chunk_size)
+
+def compress_text_lexrank(text: str, sentence_count: int = 5) -> str:
+    return " ".join(lexrank.summarize(text, sentence_count))
 
 def compress_chapter_safe(text: str, min_words: int = 100, threshold_words: int = 500) -> str:
     word_count = len(text.split())
     if word_count < threshold_words:
         return text
 
-    compressed = compress_text_sumy(text, sentence_count=30 if word_count > 1000 else 25)
+    compressed = compress_text_lexrank(text, sentence_count=30 if word_count > 1000 else 25)
     if len(compressed.split()) < min_words:
         return text  # revert if too agressive
 
     return compressed
 
+# CHAPTER COMPRESSION
+# LexRank is CPU bound and quadratic in the number of sentences, so chapters are compressed on a
+# process pool. Results are cached by chapter content and parameters: re-uploads and retried
+# jobs skip the work. COMPRESSOR is part of the cache key, change it when the output changes.
+# Inside ingestion workers, the default pool size is a share of the cores (see ingestion.INNER_WORKERS).
+COMPRESSION_WORKERS = int(os.getenv("PLEIADE_COMPRESSION_WORKERS", str(os.cpu_count() or 1)))
+COMPRESSOR = "lexrank-2"
+
+def _compression_cache_key(text: str, min_words: int, threshold_words: int) -> str:
+    params = f"{COMPRESSOR}|{lexrank.MAX_SENTENCES}|{min_words}|{threshold_words}|".encode("utf-8")
+    return hashlib.sha256(params + text.encode("utf-8")).hexdigest()
+
+def iter_compressed_chapters(chapters: List[str], min_words: int = 100, threshold_words: int = 500,
+                             workers: int = None, progress: Optional[Callable[[str, int, int], None]] = None) -> Iterator[str]:
+    """
+    compress_chapter_safe over every chapter, using the cache and a process pool. Chapters are
+    yielded in order, each one as soon as it and the chapters before it are compressed; the pool
+    keeps working while the consumer handles the yielded chapters.
+    """
+    report = progress or (lambda stage, done, total: None)
+    workers = max(1, workers or COMPRESSION_WORKERS)
+    results = {} # chapter index -> compressed text, until yielded
+    pending = {} # chapter index -> cache key
+
+    for i, chapter in enumerate(chapters):
+        if len(chapter.split()) < threshold_words:
+            results[i] = chapter
+            continue
+        key = _compression_cache_key(chapter, min_words, threshold_words)
+        cached = load_compressed_chapter(key)
+        if cached is not None:
+            results[i] = cached
+        else:
+            pending[i] = key
+
+    done = len(chapters) - len(pending)
+    next_index = 0
+    print(f"[COMPRESS_CHAPTERS] {len(pending)} chapters to compress, {done} short or cached.")
+    report("compress", done, len(chapters))
+
+    def store(i: int, compressed: str):
+        nonlocal done
+        results[i] = compressed
+        save_compressed_chapter(pending[i], compressed)
+        done += 1
+        report("compress", done, len(chapters))
 
-def preprocessing_pipeline(text: str) -> List[str]:
+    def ready():
+        nonlocal next_index
+        while next_index in results:
+            yield results.pop(next_index)
+            next_index += 1
+
+    yield from ready()
+    if workers == 1 or len(pending) <= 1:
+        for i in pending:
+            store(i, compress_chapter_safe(chapters[i], min_words, threshold_words))
+            yield from ready()
+    else:
+        context = multiprocessing.get_context("spawn")
+        executor = ProcessPoolExecutor(max_workers=min(workers, len(pending)), mp_context=context)
+        try:
+            futures = {executor.submit(compress_chapter_safe, chapters[i], min_words, threshold_words): i for i in pending}
+            for future in as_completed(futures):
+                store(futures[future], future.result())
+                yield from ready()
+        finally:
+            executor.shutdown(cancel_futures=True) # the consumer may stop before the last chapter
+
+def compress_chapters(chapters: List[str], min_words: int = 100, threshold_words: int = 500,
+                      workers: int = None, progress: Optional[Callable[[str, int, int], None]] = None) -> List[str]:
+    """compress_chapter_safe over every chapter, in order, using the cache and a process pool."""
+    return list(iter_compressed_chapters(chapters, min_words, threshold_words, workers, progress))
+
+
+# TOKEN BUDGET
+# Chunks are the units sent to the LLM (one summarize_chunk call each), so their size is bounded
+# in cl100k tokens: consecutive small chapters are packed together up to CHUNK_MAX_TOKENS, and
+# longer chapters are cut at sentence boundaries into parts of similar size. Each chunk records
+# its token count, the chapters it covers and its content hash.
+CHUNK_MAX_TOKENS = int(os.getenv("PLEIADE_CHUNK_MAX_TOKENS", "2000"))
+CHUNK_SEPARATOR = "\n\n"
+
+def _sentence_tokens(text: str, max_tokens: int) -> List[tuple]:
+    """[(sentence, tokens)], sentences longer than max_tokens being cut in windows of max_tokens tokens."""
+    pieces = []
+    for sentence in split_sentence_spans(text):
+        tokens = enc.encode(sentence)
+        if len(tokens) <= max_tokens:
+            pieces.append((sentence, len(tokens)))
+            continue
+        for i in range(0, len(tokens), max_tokens):
+            window = tokens[i:i + max_tokens]
+            pieces.append((enc.decode(window), len(window)))
+    return pieces
+
+def chunk_hash(text: str) -> str:
+    """Content hash of a chunk, used to find the chunks that changed between two revisions."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def split_to_budget(text: str, max_tokens: int = None) -> List[str]:
+    """text in as few parts of at most about max_tokens tokens as possible, balanced and cut between sentences."""
+    max_tokens = max_tokens or CHUNK_MAX_TOKENS
+    sentences = _sentence_tokens(text, max_tokens)
+    total = sum(tokens for _, tokens in sentences)
+    count = -(-total // max_tokens)
+    parts, current, current_tokens, done = [], [], 0, 0
+    for sentence, tokens in sentences:
+        # cut when the budget would overflow, or when this sentence is mostly past the next even boundary
+        boundary = total * (len(parts) + 1) / count
+        if current and (current_tokens + tokens > max_tokens or done + current_tokens + tokens / 2 > boundary):
+            parts.append("".join(current).strip())
+            done += current_tokens
+            current, current_tokens = [], 0
+        current.append(sentence)
+        current_tokens += tokens
+    if current:
+        parts.append("".join(current).strip())
+    return [part for part in parts if part]
+
+def pack_chunks(chapters: Iterable[str], max_tokens: int = None) -> Iterator[dict]:
+    """
+    Chunks {"chunk_text", "token_count", "chapters", "hash"} of at most about max_tokens tokens, in order.
+    chapters may be a stream: each chunk is yielded as soon as it is complete.
+    """
+    max_tokens = max_tokens or CHUNK_MAX_TOKENS
+    packed, packed_tokens, packed_chapters = [], 0, []
+
+    def chunk(text: str, chapter_ids: list) -> dict:
+        return {"chunk_text": text, "token_count": get_token_count(text), "chapters": chapter_ids, "hash": chunk_hash(text)}
+
+    for i, chapter in enumerate(chapters):
+        tokens = get_token_count(chapter)
+        if packed and packed_tokens + tokens > max_tokens:
+            yield chunk(CHUNK_SEPARATOR.join(packed), packed_chapters)
+            packed, packed_tokens, packed_chapters = [], 0, []
+        if tokens > max_tokens:
+            for part in split_to_budget(chapter, max_tokens):
+                yield chunk(part, [i])
+            continue
+        packed.append(chapter)
+        packed_tokens += tokens
+        packed_chapters.append(i)
+    if packed:
+        yield chunk(CHUNK_SEPARATOR.join(packed), packed_chapters)
+
+
+# PIPELINE
+# preprocessing_stream yields the final chunks one by one, so that downstream work can start on
+# the first chunks while the next chapters are compressed: ingestion summarizes them as they come
+# (see summarize_while_preprocessing in ingestion.py).
+
+def preprocessing_stream(text: str, progress: Optional[Callable[[str, int, int], None]] = None) -> Iterator[dict]:
+    """
+    Final chunks of a manuscript (see pack_chunks), in order, as they are ready.
+    progress(stage, done, total) is called as the "clean", "segment" and "compress" stages advance.
+    """
+    report = progress or (lambda stage, done, total: None)
     print(f"[PREPROCESSING_PIPELINE] Starting preprocessing pipeline.")
+
+    report("clean", 0, 1)
     text = remove_gutenberg_boilerplate(text)
     text = basic_clean(text)
-    text = remove_toc_using_chapter_density(text)
-    chunks = split_into_chapters(text)
-    chunks = [compress_chapter_safe(chunk) for chunk in chunks]
+    report("clean", 1, 1)
+
+    report("segment", 0, 1)
+    chunks = segment_chapters(text)
+    report("segment", 1, 1)
+
+    yield from pack_chunks(iter_compressed_chapters(chunks, progress=report))
     print(f"[PREPROCESSING_PIPELINE] Preprocessing pipeline complete.")
-    return chunks
\ No newline at end of file
+
+def preprocessing_pipeline(text: str, progress: Optional[Callable[[str, int, int], None]] = None) -> List[dict]:
+    """Chunks of a manuscript. progress(stage, done, total) is called as the "clean", "segment" and "compress" stages advance."""
+    return list(preprocessing_stream(text, progress))
@@ -1,23 +1,17 @@
 # backend/app/utils/rag/retrievers/analysis.py
 
-import json
-
-from pathlib import Path
 from typing import List
 
 from langchain.docstore.document import Document
 from langchain_community.vectorstores import FAISS
-from langchain_huggingface import HuggingFaceEmbeddings
 
-from backend.test.chatbot.rerankers.bge import rerank_bge
+from backend.app.storage.storage import load_book_details
+from backend.app.utils.models import embeddings
 
-STORAGE_DIR = Path("backend/app/storage")
-embedding_model = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
+from backend.app.utils.rag.rerankers.bge import rerank_bge
 
 def analysis_retriever(book_id: str, question: str) -> List[Document]:
-    book_path = STORAGE_DIR / "books" / f"book_{book_id}.json"
-    with open(book_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = load_book_details(book_id)
 
     overview = data.get("overview", {})
     chapter_summaries = data.get("analysis", {}).get("chapters", [])
@@ -42,7 +36,7 @@ def analysis_retriever(book_id: str, question: str) -> List[Document]:
         content_blocks.append((ch["chapter_name"], ch["raw_output"]))
 
     docs = [Document(page_content=f"{title}: {body}") for title, body in content_blocks]
-    vectorstore = FAISS.from_documents(docs, embedding_model)
+    vectorstore = FAISS.from_documents(docs, embeddings)
     retriever = vectorstore.as_retriever(search_kwargs={"k": 5})
     return retriever.invoke(question)
 
@@ -1,24 +1,15 @@
 # backend/app/utils/rag/retrievers/character.py
 
-import json
-
-from pathlib import Path
 from typing import List
 
 from langchain_community.vectorstores import FAISS
-from langchain_huggingface import HuggingFaceEmbeddings
 from langchain.docstore.document import Document
 
-STORAGE_DIR = Path("backend/app/storage")
-
-embedding_model = HuggingFaceEmbeddings(
-    model_name="sentence-transformers/all-MiniLM-L6-v2"
-)
+from backend.app.storage.storage import load_book_details
+from backend.app.utils.models import embeddings
 
 def character_retriever(book_id: str, question: str) -> List[Document]:
-    path = STORAGE_DIR / "books" / f"book_{book_id}.json"
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = load_book_details(book_id)
 
     character_data = data.get("analysis", {}).get("characters", [])
     docs = [
@@ -26,6 +17,6 @@ def character_retriever(book_id: str, question: str) -> List[Document]:
         for char in character_data
         if "character_name" in char and "description" in char
     ]
-    vectorstore = FAISS.from_documents(docs, embedding_model)
+    vectorstore = FAISS.from_documents(docs, embeddings)
     retriever = vectorstore.as_retriever(search_kwargs={"k": 5})
     return retriever.invoke(question)
\ No newline at end of file
@@ -1,25 +1,19 @@
 # backend/app/utils/rag/retrievers/outside.py
 
-import json
-from pathlib import Path
 from typing import List
 
 from langchain.docstore.document import Document
 from langchain_community.vectorstores import FAISS
-from langchain_huggingface import HuggingFaceEmbeddings
 
 from backend.app.storage.storage import (
+    load_book_details,
     load_book_title,
     load_book_author,
 )
-
-SOTRAGE_DIR = Path("backend/app/storage")
-embedding_model = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
+from backend.app.utils.models import embeddings
 
 def outside_retriever(book_id: str, question: str) -> List[Document]:
-    path = SOTRAGE_DIR / "books" / f"book_{book_id}.json"
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = load_book_details(book_id)
 
     overview = data.get("overview", {})
     content_blocks = []
@@ -47,7 +41,7 @@ def outside_retriever(book_id: str, question: str) -> List[Document]:
     docs = [Document(page_content=f"{title}: {content}") for title, content in content_blocks]
 
     # Create a temporary vectorstore and retriever
-    vectorstore = FAISS.from_documents(docs, embedding_model)
+    vectorstore = FAISS.from_documents(docs, embeddings)
     retriever = vectorstore.as_retriever(search_kwargs={"k": 5})
     
     return retriever.invoke(question)
@@ -1,21 +1,15 @@
 # backend/app/utils/rag/retrievers/places.py
 
-import json
-
-from pathlib import Path
 from typing import List
 
 from langchain_community.vectorstores import FAISS
-from langchain_huggingface import HuggingFaceEmbeddings
 from langchain.docstore.document import Document
 
-STORAGE_DIR = Path("backend/app/storage")
-embedding_model = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
+from backend.app.storage.storage import load_book_details
+from backend.app.utils.models import embeddings
 
 def places_retriever(book_id: str, question: str) -> List[Document]:
-    path = STORAGE_DIR / "books" / f"book_{book_id}.json"
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = load_book_details(book_id)
 
     locations = data.get("analysis", {}).get("locations", [])
     docs = [
@@ -23,6 +17,6 @@ def places_retriever(book_id: str, question: str) -> List[Document]:
         for loc in locations
         if "location_name" in loc and "description" in loc
     ]
-    vectorstore = FAISS.from_documents(docs, embedding_model)
+    vectorstore = FAISS.from_documents(docs, embeddings)
     retriever = vectorstore.as_retriever(search_kwargs={"k": 5})
     return retriever.invoke(question)
\ No newline at end of file
@@ -1,32 +1,27 @@
 # backend/app/utils/rag/retrievers/plot.py
 
-import json
-
-from pathlib import Path
 from typing import List
 
-from langchain_huggingface import HuggingFaceEmbeddings
 from langchain.docstore.document import Document
 
 from backend.app.utils.rag.rerankers.bge import rerank_bge
-
-STORAGE_DIR = Path("backend/app/storage")
-embedding_model = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
+from backend.app.storage.storage import load_book_chunks, load_book_details
+from backend.app.utils.details.llm import chapter_labels
+from backend.app.utils.models import embeddings
 
 def get_chapter_summary(chapter_num: int, book_id) -> str:
-    path = STORAGE_DIR / "books" / f"book_{book_id}.json"
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    """Summary of a chapter: the summaries covering it (its parts when it was split, or the chapters packed with it)."""
+    data = load_book_details(book_id)
     chapters = data.get("analysis", {}).get("chapters", [])
-    for chapter in chapters:
-        if chapter.get("chapter_name") == f"Chapter {chapter_num}":
-            return chapter.get("raw_output", "")
-    return ""
+    chapter_num = int(chapter_num)
+    return " ".join(
+        chapter.get("raw_output", "")
+        for i, chapter in enumerate(chapters)
+        if chapter_num in chapter.get("chapters", [i + 1]) # summaries made before chapters were recorded: one per chapter
+    )
 
 def _load_chapter_summaries(book_id: str) -> List[Document]:
-    path = STORAGE_DIR / "books" / f"book_{book_id}.json"
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = load_book_details(book_id)
     chapters = data.get("analysis", {}).get("chapters", [])
     return [
         Document(page_content=f"{c['chapter_name']}: {c['raw_output']}")
@@ -35,17 +30,15 @@ def _load_chapter_summaries(book_id: str) -> List[Document]:
     ]
 
 def _load_plot_chunks(book_id: str) -> List[Document]:
-    path = STORAGE_DIR / "books_overview.json"
-    with open(path, "r", encoding="utf-8") as f:
-        books = json.load(f)
-
-    book = next((b for b in books if b.get("id") == book_id), None)
-    if not book or "chunks" not in book:
+    try:
+        chunks = load_book_chunks(book_id)
+    except ValueError:
         return []
+    chunks = [chunk for chunk in chunks if "chunk_text" in chunk]
+    labels = chapter_labels([chunk.get("chapters") or [chunk["chunk_id"]] for chunk in chunks])
     return [
-    Document(page_content=f"Chapter {chunk['chunk_id'] + 1}: {chunk['chunk_text']}")
-        for chunk in book["chunks"]
-        if "chunk_text" in chunk
+        Document(page_content=f"{label}: {chunk['chunk_text']}")
+        for label, chunk in zip(labels, chunks)
     ]
 
 def plot_retriever_hybrid(book_id: str, query: str, top_k: int = 4) -> List[Document]:
@@ -56,8 +49,8 @@ def plot_retriever_hybrid(book_id: str, query: str, top_k: int = 4) -> List[Docu
     all_docs = summaries + plot_chunks
 
     # embed everything
-    query_embedding = embedding_model.embed_query(query)
-    doc_embeddings = embedding_model.embed_documents([doc.page_content for doc in all_docs])
+    query_embedding = embeddings.embed_query(query)
+    doc_embeddings = embeddings.embed_documents([doc.page_content for doc in all_docs])
 
     # compute cosine similarity manually because FAISS cant handle cross source merging
     # import numpy as np
@@ -0,0 +1,83 @@
+# backend/app/utils/stages.py
+
+import os
+import time
+
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, Iterable, List, NamedTuple
+
+# Generation is described as a graph of stages: each stage names the artifacts it needs and
+# produces one artifact named after itself. run_stages computes the requested artifacts, running
+# every stage whose inputs are ready at the same time (the stages mostly wait on LLM calls), and
+# each artifact once, whatever the number of stages that need it.
+STAGE_WORKERS = int(os.getenv("PLEIADE_STAGE_WORKERS", "6"))
+
+class Stage(NamedTuple):
+    name: str
+    inputs: tuple
+    run: Callable # called with the input artifacts as keyword arguments
+
+def stage(name: str, *inputs: str):
+    """Decorator turning a function of the input artifacts into a Stage."""
+    def wrap(fn: Callable) -> Stage:
+        return Stage(name, inputs, fn)
+    return wrap
+
+def _plan(graph: Dict[str, Stage], targets: Iterable[str], available: dict) -> List[str]:
+    """Names of the stages needed for targets, given the artifacts already available."""
+    needed, pending = [], list(targets)
+    while pending:
+        name = pending.pop()
+        if name in available or name in needed:
+            continue
+        if name not in graph:
+            raise KeyError(f"No stage produces '{name}'")
+        needed.append(name)
+        pending.extend(graph[name].inputs)
+    return needed
+
+def run_stages(stages: Iterable[Stage], targets: Iterable[str], artifacts: dict = None,
+               workers: int = None, on_result: Callable[[str, object], None] = None):
+    """
+    Compute targets from the given artifacts. Returns (artifacts, timings): every artifact
+    available at the end, and the seconds spent in each stage that ran. on_result(name, value) is
+    called (from the calling thread) as each stage completes. The first failing stage stops
+    the run: stages not started yet are cancelled and its exception is raised.
+    """
+    graph = {s.name: s for s in stages}
+    artifacts = dict(artifacts or {})
+    needed = set(_plan(graph, targets, artifacts))
+    timings = {}
+    started_at = time.perf_counter()
+
+    def run(s: Stage):
+        started = time.perf_counter()
+        try:
+            return s.run(**{name: artifacts[name] for name in s.inputs})
+        finally:
+            timings[s.name] = round(time.perf_counter() - started, 3)
+
+    running = {} # future -> stage name
+    with ThreadPoolExecutor(max_workers=max(1, workers or STAGE_WORKERS), thread_name_prefix="stage") as executor:
+        while needed or running:
+            for name in [n for n in needed if all(i in artifacts for i in graph[n].inputs)]:
+                needed.discard(name)
+                running[executor.submit(run, graph[name])] = name
+            if not running:
+                raise ValueError(f"Stages {sorted(needed)} depend on each other")
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                if future.exception() is not None:
+                    for other in running:
+                        other.cancel()
+                    print(f"[STAGES] '{name}' failed after {timings.get(name, 0)}s: {future.exception()}")
+                    raise future.exception()
+                artifacts[name] = future.result()
+                if on_result:
+                    on_result(name, artifacts[name])
+
+    slowest = ", ".join(f"{n} {t}s" for n, t in sorted(timings.items(), key=lambda x: -x[1])[:5])
+    print(f"[STAGES] {len(timings)} stages in {time.perf_counter() - started_at:.1f}s (slowest: {slowest}).")
+    return artifacts, timings
@@ -0,0 +1,49 @@
+# backend/test/ingestion/revision_dedup.py
+
+import os
+import shutil
+import tempfile
+
+from pathlib import Path
+
+# Isolated SQLite storage: must be set before the storage modules are imported
+TMP = Path(tempfile.mkdtemp(prefix="pleiade_test_"))
+os.environ["PLEIADE_STORAGE_ENGINE"] = "sqlite"
+os.environ["PLEIADE_SQLITE_PATH"] = str(TMP / "pleiade.db")
+os.environ["PLEIADE_SUMMARIZE_ON_INGEST"] = "off" # no LLM call
+
+from backend.app.storage.storage import load_book_text, load_book_meta
+from backend.app.storage.storage import load_job
+from backend.app.utils.preprocessing.ingestion import create_ingestion_job, run_ingestion_job
+
+DATA_PATH = Path("backend/test/data")
+
+def ingest(book_id: str, source: Path, revision_of: str = None) -> dict:
+    upload = TMP / f"{book_id}_{source.name}"
+    shutil.copy(source, upload)
+    job = create_ingestion_job(book_id, upload, source.name, book_id, "", "", revision_of=revision_of)
+    run_ingestion_job(job["id"])
+    job = load_job(job["id"])
+    assert job["status"] == "done", job["error"]
+    return job
+
+if __name__ == "__main__":
+    try:
+        draft, revised = DATA_PATH / "echoes.txt", DATA_PATH / "alice_in_wonderland.txt"
+
+        ingest("aaaa0001", draft)
+        assert ingest("aaaa0002", draft)["duplicate_of"] == "aaaa0001"
+
+        # aaaa0001 becomes a new draft with another text
+        ingest("aaaa0001", revised, revision_of="aaaa0001")
+        assert load_book_meta("aaaa0001")["revision"] == 2
+
+        # the old draft is no longer aaaa0001's content: not a duplicate of it...
+        job = ingest("aaaa0003", draft)
+        assert job["duplicate_of"] != "aaaa0001", job
+        assert load_book_text("aaaa0003") == load_book_text("aaaa0002")
+        # ...while the revised text is
+        assert ingest("aaaa0004", revised)["duplicate_of"] == "aaaa0001"
+        print("Re-uploading an old draft after a revision: OK")
+    finally:
+        shutil.rmtree(TMP, ignore_errors=True)
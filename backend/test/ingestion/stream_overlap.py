@@ -0,0 +1,49 @@
+# backend/test/ingestion/stream_overlap.py
+
+import os
+import shutil
+import tempfile
+import time
+
+from pathlib import Path
+
+# Isolated SQLite storage: must be set before the storage modules are imported
+TMP = Path(tempfile.mkdtemp(prefix="pleiade_test_"))
+os.environ["PLEIADE_STORAGE_ENGINE"] = "sqlite"
+os.environ["PLEIADE_SQLITE_PATH"] = str(TMP / "pleiade.db")
+
+from backend.app.utils.details import llm
+from backend.app.utils.preprocessing import ingestion
+from backend.app.utils.preprocessing.preprocessing import preprocessing_stream
+
+DATA_PATH = Path("backend/test/data")
+summary_starts = []
+
+def fake_summarize_chunk(chunk_text: str) -> dict:
+    """Stands in for the LLM call: records when it starts and takes the time of a round trip."""
+    summary_starts.append(time.perf_counter())
+    time.sleep(0.2)
+    return {"raw_output": chunk_text[:100], "suggested_title": ""}
+
+if __name__ == "__main__":
+    llm.summarize_chunk = fake_summarize_chunk
+    preprocessing_done = []
+
+    def timed_stream(text):
+        yield from preprocessing_stream(text)
+        preprocessing_done.append(time.perf_counter())
+
+    try:
+        text = (DATA_PATH / "moby_dick.txt").read_text(encoding="utf-8", errors="replace")
+        chunks = ingestion.summarize_while_preprocessing(timed_stream(text))
+
+        assert len(summary_starts) == len(chunks) > 1
+        lead = preprocessing_done[0] - summary_starts[0]
+        print(f"{len(chunks)} chunks, first summary started {lead:.2f}s before the end of preprocessing")
+        assert lead > 0, "summaries did not overlap preprocessing"
+        # the summaries are in the cache for the details generation
+        breakdown = llm.build_chapter_breakdown(chunks)
+        assert len(summary_starts) == len(chunks) and len(breakdown) == len(chunks)
+        print("Summaries overlap preprocessing: OK")
+    finally:
+        shutil.rmtree(TMP, ignore_errors=True)
@@ -0,0 +1,46 @@
+# backend/test/preprocessing/lexrank_benchmark.py
+
+import time
+
+from pathlib import Path
+from sumy.parsers.plaintext import PlaintextParser
+from sumy.nlp.tokenizers import Tokenizer
+from sumy.summarizers.lex_rank import LexRankSummarizer
+
+from backend.app.utils.preprocessing import lexrank
+from backend.app.utils.preprocessing.preprocessing import remove_gutenberg_boilerplate, basic_clean, segment_chapters
+
+DATA_PATH = Path("backend/test/data")
+THRESHOLD_WORDS = 500 # same rule as compress_chapter_safe
+
+def sumy_summary(text: str, sentence_count: int):
+    parser = PlaintextParser.from_string(text, Tokenizer("english"))
+    return [str(sentence) for sentence in LexRankSummarizer()(parser.document, sentence_count)]
+
+if __name__ == "__main__":
+    total_sumy = total_numpy = 0.0
+    for path in sorted(DATA_PATH.glob("*.txt")):
+        text = basic_clean(remove_gutenberg_boilerplate(path.read_text(encoding="utf-8", errors="replace")))
+        chapters = [c for c in segment_chapters(text) if len(c.split()) >= THRESHOLD_WORDS]
+        identical, sumy_time, numpy_time = 0, 0.0, 0.0
+
+        for chapter in chapters:
+            sentence_count = 30 if len(chapter.split()) > 1000 else 25
+
+            start = time.perf_counter()
+            expected = sumy_summary(chapter, sentence_count)
+            sumy_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            summary = lexrank.summarize(chapter, sentence_count)
+            numpy_time += time.perf_counter() - start
+
+            identical += summary == expected
+
+        total_sumy += sumy_time
+        total_numpy += numpy_time
+        speedup = sumy_time / numpy_time if numpy_time else 0
+        print(f"{path.name:<40} {len(chapters):>4} chapters | identical {identical}/{len(chapters)} | "
+              f"sumy {sumy_time:7.2f}s | numpy {numpy_time:6.2f}s | x{speedup:.1f}")
+
+    print(f"\nTotal: sumy {total_sumy:.2f}s, numpy {total_numpy:.2f}s (x{total_sumy / max(total_numpy, 1e-9):.1f})")
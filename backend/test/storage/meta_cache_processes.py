@@ -0,0 +1,62 @@
+# backend/test/storage/meta_cache_processes.py
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+from pathlib import Path
+
+# Isolated SQLite storage: must be set before the storage modules are imported. Spawned children
+# re-import this module and inherit the environment, so they open the same database.
+if "PLEIADE_TEST_TMP" not in os.environ:
+    os.environ["PLEIADE_TEST_TMP"] = tempfile.mkdtemp(prefix="pleiade_test_")
+TMP = Path(os.environ["PLEIADE_TEST_TMP"])
+os.environ["PLEIADE_STORAGE_ENGINE"] = "sqlite"
+os.environ["PLEIADE_SQLITE_PATH"] = str(TMP / "pleiade.db")
+
+from backend.app.storage.storage import save_book, save_book_details, load_book_meta, load_catalog_page
+from backend.app.storage.storage import save_content_digest, find_book_by_digest
+
+BOOK_ID = "cccc0001"
+
+def book_record(revision: int, digest: str) -> dict:
+    return {
+        "id": BOOK_ID, "title": f"Draft {revision}", "author": "", "pages": 1, "status": "ready",
+        "revision": revision, "digests": [digest], "text": f"Text of draft {revision}.",
+        "chunks": [{"chunk_id": 0, "chunk_text": f"Text of draft {revision}."}],
+    }
+
+def revise_in_child():
+    """Run in a spawned process, like an ingestion worker: a new revision of the book."""
+    save_book(book_record(2, "digest-2"))
+
+def save_details_in_child():
+    save_book_details(BOOK_ID, {"analysis": {}, "overview": {}, "marketing": {}})
+
+def run_in_child(target):
+    process = multiprocessing.get_context("spawn").Process(target=target)
+    process.start()
+    process.join()
+    assert process.exitcode == 0, f"{target.__name__} failed"
+
+if __name__ == "__main__":
+    try:
+        save_book(book_record(1, "digest-1"))
+        save_content_digest("digest-1", BOOK_ID)
+        assert find_book_by_digest("digest-1") == BOOK_ID
+        assert load_book_meta(BOOK_ID)["revision"] == 1 # cached in this process
+
+        run_in_child(revise_in_child)
+        meta = load_book_meta(BOOK_ID)
+        assert (meta["revision"], meta["title"]) == (2, "Draft 2"), meta
+        assert find_book_by_digest("digest-1") is None
+        print("Meta written by another process is read back: OK")
+
+        run_in_child(save_details_in_child)
+        meta = load_book_meta(BOOK_ID)
+        assert meta["hasDetails"] and meta["revision"] == 2 and meta["digests"] == ["digest-2"], meta
+        assert load_catalog_page(fields=["hasDetails"])["items"][0]["hasDetails"] is True
+        print("hasDetails set by another process keeps the latest revision: OK")
+    finally:
+        shutil.rmtree(TMP, ignore_errors=True)
@@ -0,0 +1,40 @@
+# backend/test/storage/serialization_benchmark.py
+
+import json
+import time
+
+from pathlib import Path
+
+from backend.app.storage import serialization
+
+FIXTURES = [
+    Path("backend/app/storage/books_overview.json"),
+    Path("backend/app/storage/books/book_de1b8499.json"),
+    Path("backend/app/storage/thema_codes/thema_codes.json"),
+]
+RUNS = 10
+
+def timed(fn, runs=RUNS):
+    start = time.perf_counter()
+    for _ in range(runs):
+        result = fn()
+    return (time.perf_counter() - start) / runs * 1000, result
+
+if __name__ == "__main__":
+    for path in FIXTURES:
+        if not path.exists():
+            print(f"Skipping {path} (not found)")
+            continue
+        raw = path.read_bytes()
+        data = json.loads(raw)
+
+        json_load, _ = timed(lambda: json.loads(raw))
+        orjson_load, _ = timed(lambda: serialization.loads(raw))
+        json_dump, json_out = timed(lambda: json.dumps(data, indent=4, ensure_ascii=False).encode("utf-8"))
+        orjson_dump, orjson_out = timed(lambda: serialization.dumps(data))
+        assert serialization.loads(orjson_out) == data
+
+        print(f"\n{path} ({len(raw) / 1024:.0f} KB)")
+        print(f"  parse : json {json_load:8.2f} ms | orjson {orjson_load:8.2f} ms | x{json_load / orjson_load:.1f}")
+        print(f"  encode: json {json_dump:8.2f} ms | orjson {orjson_dump:8.2f} ms | x{json_dump / orjson_dump:.1f}")
+        print(f"  size  : indent=4 {len(json_out) / 1024:.0f} KB | compact {len(orjson_out) / 1024:.0f} KB")
@@ -10,26 +10,34 @@ interface Book {
     cover: string;
     author: string;
     uploadDate: string;
+    pages: number;
     progress: number;
     synopsis: string;
-    full_text: string;
-    chunks: [];
     hasDetails: boolean;
 }
 
+interface BooksPage {
+    items: Book[];
+    next_cursor: string | null;
+}
+
 function App() {
     const [selectedBook, setSelectedBook] = useState<Book | null>(null);
     const [books, setBooks] = useState<Book[]>([]);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
 
     useEffect(() => {
         fetchBooks();
     }, []);
 
-    const fetchBooks = async () => {
+    // Loads the first catalog page, or the page after `cursor` appended to the current list
+    const fetchBooks = async (cursor: string | null = null) => {
         try {
-            const response = await fetch(`${import.meta.env.VITE_API_URL}/books`);
-            const data = await response.json();
-            setBooks(data);
+            const params = cursor ? `?cursor=${encodeURIComponent(cursor)}` : "";
+            const response = await fetch(`${import.meta.env.VITE_API_URL}/books${params}`);
+            const data: BooksPage = await response.json();
+            setBooks((previous) => (cursor ? [...previous, ...data.items] : data.items));
+            setNextCursor(data.next_cursor);
             console.log("Books fetched:", data);
         } catch (error) {
             console.error("Error fetching books:", error);
@@ -68,7 +76,7 @@ function App() {
                     />
                 ) : (
                     <>
-                        <UploadArea onUploadSuccess={fetchBooks} />
+                        <UploadArea onUploadSuccess={() => fetchBooks()} />
 
                         <div className="mt-12">
                             <h2 className="text-2xl font-semibold text-white mb-6">Your Books</h2>
@@ -82,6 +90,16 @@ function App() {
                                     />
                                 ))}
                             </div>
+                            {nextCursor && (
+                                <div className="mt-6 flex justify-center">
+                                    <button
+                                        className="px-4 py-2 rounded-lg bg-white/10 text-white text-sm font-medium hover:bg-white/20 transition-colors"
+                                        onClick={() => fetchBooks(nextCursor)}
+                                    >
+                                        Load more
+                                    </button>
+                                </div>
+                            )}
                         </div>
                     </>
                 )}
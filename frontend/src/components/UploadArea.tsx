@@ -5,10 +5,23 @@ interface UploadAreaProps {
     onUploadSuccess: () => void;
 }
 
+interface IngestionJob {
+    id: string;
+    status: "queued" | "running" | "done" | "failed";
+    stage: string | null;
+    progress: number;
+    error: string | null;
+}
+
+const JOB_POLL_INTERVAL_MS = 1000;
+const JOB_TIMEOUT_MS = 30 * 60 * 1000; // give up on a job that never finishes (e.g. lost after a server restart)
+
 const UploadArea: React.FC<UploadAreaProps> = ({ onUploadSuccess }) => {
     const [isDragging, setIsDragging] = useState(false);
     const [isUploading, setIsUploading] = useState(false);
     const [uploadProgress, setUploadProgress] = useState(0);
+    const [uploadStage, setUploadStage] = useState<string | null>(null);
+    const [uploadError, setUploadError] = useState<string | null>(null);
     const [title, setTitle] = useState("");
     const [author, setAuthor] = useState("");
     const [selectedFile, setSelectedFile] = useState<File | null>(null);
@@ -20,6 +33,7 @@ const UploadArea: React.FC<UploadAreaProps> = ({ onUploadSuccess }) => {
         if (!selectedFile) return;
 
         setIsUploading(true);
+        setUploadError(null);
         const formData = new FormData();
         formData.append("file", selectedFile);
         if (coverFile) formData.append("cover", coverFile);
@@ -31,14 +45,25 @@ const UploadArea: React.FC<UploadAreaProps> = ({ onUploadSuccess }) => {
                 method: "POST",
                 body: formData,
             });
-            const data = await response.json();
-            console.log("Upload success:", data);
-            onUploadSuccess?.();
+            const data = await response.json().catch(() => ({}));
+            if (!response.ok || !data.job_id) {
+                throw new Error(data.detail ?? `Upload failed (HTTP ${response.status})`);
+            }
+            console.log("Upload queued:", data);
+            const job = await waitForJob(data.job_id);
+            if (job.status === "failed") {
+                console.error("Error processing upload:", job.error);
+                setUploadError(job.error ?? "Processing failed");
+            } else {
+                onUploadSuccess?.();
+            }
         } catch (err) {
             console.error("Error uploading:", err);
+            setUploadError(err instanceof Error ? err.message : String(err));
         } finally {
             setIsUploading(false);
             setUploadProgress(0);
+            setUploadStage(null);
             setSelectedFile(null);
             setCoverFile(null);
             setTitle("");
@@ -46,6 +71,25 @@ const UploadArea: React.FC<UploadAreaProps> = ({ onUploadSuccess }) => {
         }
     };
 
+    // Polls the ingestion job until the worker is done with it (throws on an error response or after JOB_TIMEOUT_MS)
+    const waitForJob = async (jobId: string): Promise<IngestionJob> => {
+        const deadline = Date.now() + JOB_TIMEOUT_MS;
+        while (true) {
+            const response = await fetch(`${import.meta.env.VITE_API_URL}/upload/jobs/${jobId}`);
+            if (!response.ok) {
+                throw new Error(`Could not follow the upload (HTTP ${response.status})`);
+            }
+            const job: IngestionJob = await response.json();
+            setUploadProgress(Math.round(job.progress * 100));
+            setUploadStage(job.stage);
+            if (job.status === "done" || job.status === "failed") return job;
+            if (Date.now() > deadline) {
+                throw new Error("The upload is taking too long, please try again later");
+            }
+            await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+        }
+    };
+
     const handleDragOver = (e: React.DragEvent) => {
         e.preventDefault();
         setIsDragging(true);
@@ -85,12 +129,15 @@ const UploadArea: React.FC<UploadAreaProps> = ({ onUploadSuccess }) => {
                         ></div>
                     </div>
                     <p className="text-white text-lg">
-                        Analyzing your book... {uploadProgress}%
+                        Analyzing your book{uploadStage ? ` (${uploadStage})` : ""}... {uploadProgress}%
                     </p>
                 </div>
             ) : (
                 <>
                     <Upload className="h-12 w-12 text-white mx-auto mb-4" />
+                    {uploadError && (
+                        <p className="text-red-200 mb-2">Upload failed: {uploadError}</p>
+                    )}
                     <p className="text-white text-lg mb-2">
                         Drag and drop your manuscript here
                     </p>
@@ -15,6 +15,10 @@ echo "📦 Installing backend dependencies from requirements.txt..."
 source env_pleiade/bin/activate
 pip install --upgrade pip
 pip install -r backend/requirements.txt
+
+# nltk data used by the preprocessing (checked by /health/ready, never downloaded while serving)
+echo "📚 Downloading nltk data (punkt_tab)..."
+python -c "import nltk; nltk.download('punkt_tab')"
 deactivate
 
 # Step 3: Install frontend dependencies